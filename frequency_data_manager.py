@@ -6,14 +6,19 @@ This module integrates the API client and database components.
 
 import os
 import sys
-import json
+import time
 import logging
+import orjson
 import argparse
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
+from itertools import groupby
+from operator import itemgetter
 from typing import Dict, List, Any, Optional, Union
 
 from uisp_api_client import UISPAPIClient, FrequencyDataCollector
 from frequency_database import FrequencyDatabase, create_database
+from json_stream import REPORT_BUFFER_SIZE, JsonStreamWriter, encode_key
 
 # Configure logging
 logging.basicConfig(
@@ -22,6 +27,16 @@ logging.basicConfig(
 )
 logger = logging.getLogger('data_collection_integration')
 
+# Frequency allocations are keyed by integer frequency, so allow non-str keys
+REPORT_JSON_OPTIONS = orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS
+
+# Top-level report keys, encoded once instead of on every report
+_K_TIMESTAMP = encode_key('timestamp')
+_K_SUMMARY = encode_key('summary')
+_K_CONFLICTS = encode_key('conflicts')
+_K_FREQUENCY_ALLOCATION = encode_key('frequency_allocation')
+_K_SITES = encode_key('sites')
+
 class FrequencyDataManager:
     """
     Manages the collection and storage of frequency data
@@ -49,25 +64,27 @@ class FrequencyDataManager:
         Returns:
             ID of the stored frequency scan
         """
-        # Collect device data
-        logger.info("Collecting device data from UISP API")
-        devices = self.collector.get_devices(force_refresh)
-        self.database.store_devices(devices)
+        # The three collections are independent API calls, so fetch them
+        # concurrently and wait on the slowest round-trip instead of the sum
+        logger.info("Collecting device, site and wireless configuration data from UISP API")
+        with ThreadPoolExecutor(max_workers=3) as executor:
+            devices_future = executor.submit(self.collector.get_devices, force_refresh)
+            sites_future = executor.submit(self.collector.get_sites, force_refresh)
+            wireless_configs_future = executor.submit(
+                self.collector.get_wireless_configuration, force_refresh
+            )
         
-        # Collect site data
-        logger.info("Collecting site data from UISP API")
-        sites = self.collector.get_sites(force_refresh)
-        self.database.store_sites(sites)
+        # Stamp every row written by this collection with the same time
+        now_ms = int(time.time() * 1000)
         
-        # Collect wireless configuration data
-        logger.info("Collecting wireless configuration data from UISP API")
-        wireless_configs = self.collector.get_wireless_configuration(force_refresh)
-        self.database.store_wireless_configs(wireless_configs)
+        self.database.store_devices(devices_future.result(), timestamp=now_ms)
+        self.database.store_sites(sites_future.result(), timestamp=now_ms)
+        self.database.store_wireless_configs(wireless_configs_future.result(), timestamp=now_ms)
         
         # Collect and store complete frequency scan
         logger.info("Processing and storing complete frequency scan")
         frequency_data = self.collector.get_frequency_data()
-        scan_id = self.database.store_frequency_scan(frequency_data)
+        scan_id = self.database.store_frequency_scan(frequency_data, timestamp=now_ms)
         
         logger.info(f"Data collection and storage completed. Scan ID: {scan_id}")
         return scan_id
@@ -91,8 +108,8 @@ class FrequencyDataManager:
                 return False
             
             # Write to file
-            with open(output_file, 'w') as f:
-                json.dump(scan_data, f, indent=2)
+            with open(output_file, 'wb') as f:
+                f.write(orjson.dumps(scan_data, option=REPORT_JSON_OPTIONS))
             
             logger.info(f"Latest frequency scan exported to {output_file}")
             return True
@@ -122,95 +139,109 @@ class FrequencyDataManager:
             True if successful, False otherwise
         """
         try:
-            # Get latest data
-            devices = self.database.get_devices()
-            sites = self.database.get_sites()
-            wireless_configs = self.database.get_wireless_configs()
+            # Joins and ordering run in SQLite, so the report is built from
+            # plain row tuples rather than per-record dictionaries
+            counts = self.database.get_record_counts()
+            allocation_rows = self.database.get_frequency_allocation_rows()
+            site_rows = self.database.get_site_device_rows()
             conflicts = self.database.get_frequency_conflicts()
             
-            # Prepare report data
-            report = {
-                'timestamp': datetime.now().isoformat(),
-                'summary': {
-                    'total_devices': len(devices),
-                    'total_sites': len(sites),
-                    'total_wireless_configs': len(wireless_configs),
+            # Stream the report section by section so only one entry is
+            # held in memory at a time
+            with open(output_file, 'wb', buffering=REPORT_BUFFER_SIZE) as f:
+                writer = JsonStreamWriter(f)
+                writer.begin_object()
+                writer.write_value(datetime.now().isoformat(), key=_K_TIMESTAMP)
+                writer.write_value({
+                    'total_devices': counts['devices'],
+                    'total_sites': counts['sites'],
+                    'total_wireless_configs': counts['wireless_configs'],
                     'total_conflicts': len(conflicts)
-                },
-                'conflicts': conflicts,
-                'frequency_allocation': {},
-                'sites': {}
-            }
-            
-            # Process wireless configs by frequency
-            for config in wireless_configs:
-                frequency = config.get('frequency')
-                if not frequency:
-                    continue
+                }, key=_K_SUMMARY)
                 
-                if frequency not in report['frequency_allocation']:
-                    report['frequency_allocation'][frequency] = []
+                writer.begin_array(key=_K_CONFLICTS)
+                for conflict in conflicts:
+                    writer.write_value(conflict)
+                writer.end_array()
                 
-                device_id = config.get('deviceId')
-                if not device_id:
-                    continue
+                writer.begin_object(key=_K_FREQUENCY_ALLOCATION)
+                for frequency, allocations in self._iter_frequency_allocation(allocation_rows):
+                    writer.write_value(allocations, key=frequency)
+                writer.end_object()
                 
-                # Find device info
-                device_info = None
-                for device in devices:
-                    if device.get('id') == device_id:
-                        device_info = {
-                            'id': device.get('id'),
-                            'name': device.get('name', 'Unknown'),
-                            'model': device.get('model', 'Unknown'),
-                            'site_id': device.get('siteId')
-                        }
-                        break
+                writer.begin_object(key=_K_SITES)
+                for site_id, site_entry in self._iter_site_entries(site_rows):
+                    writer.write_value(site_entry, key=site_id)
+                writer.end_object()
                 
-                if device_info:
-                    report['frequency_allocation'][frequency].append({
-                        'device': device_info,
-                        'ssid': config.get('ssid'),
-                        'channel_width': config.get('channelWidth'),
-                        'tx_power': config.get('txPower')
-                    })
-            
-            # Process sites with devices
-            for site in sites:
-                site_id = site.get('id')
-                if not site_id:
-                    continue
-                
-                site_devices = []
-                for device in devices:
-                    if device.get('siteId') == site_id:
-                        site_devices.append({
-                            'id': device.get('id'),
-                            'name': device.get('name', 'Unknown'),
-                            'model': device.get('model', 'Unknown')
-                        })
-                
-                report['sites'][site_id] = {
-                    'id': site_id,
-                    'name': site.get('name', 'Unknown'),
-                    'location': {
-                        'latitude': site.get('latitude'),
-                        'longitude': site.get('longitude'),
-                        'elevation': site.get('elevation')
-                    },
-                    'devices': site_devices
-                }
-            
-            # Write report to file
-            with open(output_file, 'w') as f:
-                json.dump(report, f, indent=2)
+                writer.end_object()
             
             logger.info(f"Frequency report generated and saved to {output_file}")
             return True
         except Exception as e:
             logger.error(f"Failed to generate frequency report: {str(e)}")
             return False
-
+    
+    def _iter_frequency_allocation(self, allocation_rows: List[tuple]):
+        """
+        Yield report allocation entries grouped by frequency
+        
+        Args:
+            allocation_rows: Rows from FrequencyDatabase.get_frequency_allocation_rows()
+            
+        Yields:
+            Tuples of (frequency, list of allocation dictionaries)
+        """
+        for frequency, rows in groupby(allocation_rows, key=itemgetter(0)):
+            yield frequency, [
+                {
+                    'device': {
+                        'id': device_id,
+                        'name': name,
+                        'model': model,
+                        'site_id': site_id
+                    },
+                    'ssid': ssid,
+                    'channel_width': channel_width,
+                    'tx_power': tx_power
+                }
+                for (_, device_id, name, model, site_id,
+                     ssid, channel_width, tx_power) in rows
+                if device_id is not None
+            ]
+    
+    def _iter_site_entries(self, site_rows: List[tuple]):
+        """
+        Yield report entries for each site with its devices
+        
+        Args:
+            site_rows: Rows from FrequencyDatabase.get_site_device_rows()
+            
+        Yields:
+            Tuples of (site ID, site dictionary)
+        """
+        for site_id, rows in groupby(site_rows, key=itemgetter(0)):
+            rows = list(rows)
+            _, name, latitude, longitude, elevation = rows[0][:5]
+            
+            yield site_id, {
+                'id': site_id,
+                'name': name,
+                'location': {
+                    'latitude': latitude,
+                    'longitude': longitude,
+                    'elevation': elevation
+                },
+                'devices': [
+                    {
+                        'id': device_id,
+                        'name': device_name,
+                        'model': device_model
+                    }
+                    for *_, device_id, device_name, device_model in rows
+                    if device_id is not None
+                ]
+            }
 
 def main():
     """Main function"""
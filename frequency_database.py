@@ -4,13 +4,17 @@ Database Module for NYC Mesh Frequency Management Tool
 This module handles database operations for storing and retrieving frequency data.
 """
 
+import io
 import sqlite3
-import json
 import logging
-from datetime import datetime
+import orjson
+import time
+import zstandard
 from typing import Dict, List, Any, Optional, Union
 import os
 
+from json_stream import JsonStreamWriter
+
 # Configure logging
 logging.basicConfig(
     level=logging.INFO,
@@ -18,6 +22,192 @@ logging.basicConfig(
 )
 logger = logging.getLogger('frequency_db')
 
+# Encodings of frequency_scans.data, recorded per row in data_format
+SCAN_FORMAT_JSON = 0  # Legacy JSON text
+SCAN_FORMAT_ZSTD = 1  # zstd-compressed JSON bytes
+
+SCAN_COMPRESSION_LEVEL = 3
+
+# Mapping of API field names to the typed table columns they are stored in
+DEVICE_COLUMNS = {
+    'id': 'id',
+    'name': 'name',
+    'model': 'model',
+    'type': 'type',
+    'siteId': 'site_id'
+}
+
+SITE_COLUMNS = {
+    'id': 'id',
+    'name': 'name',
+    'latitude': 'latitude',
+    'longitude': 'longitude',
+    'elevation': 'elevation'
+}
+
+WIRELESS_CONFIG_COLUMNS = {
+    'id': 'id',
+    'deviceId': 'device_id',
+    'ssid': 'ssid',
+    'frequency': 'frequency',
+    'channelWidth': 'channel_width',
+    'txPower': 'tx_power'
+}
+
+# Statements are defined once so every call reuses the same SQL string,
+# and with it sqlite3's cached prepared statement
+_SQL_INSERT_DEVICE = '''
+INSERT OR REPLACE INTO devices
+(id, name, model, type, site_id, last_updated)
+VALUES (?, ?, ?, ?, ?, ?)
+'''
+
+_SQL_INSERT_SITE = '''
+INSERT OR REPLACE INTO sites
+(id, name, latitude, longitude, elevation, last_updated)
+VALUES (?, ?, ?, ?, ?, ?)
+'''
+
+_SQL_INSERT_WCFG = '''
+INSERT OR REPLACE INTO wireless_configs
+(id, device_id, ssid, frequency, channel_width, tx_power, last_updated)
+VALUES (?, ?, ?, ?, ?, ?, ?)
+'''
+
+_SQL_INSERT_SCAN = '''
+INSERT INTO frequency_scans
+(timestamp, data, data_format)
+VALUES (?, ?, ?)
+'''
+
+_SQL_SELECT_SCAN = 'SELECT data, data_format FROM frequency_scans WHERE id = ?'
+
+# Scan IDs are AUTOINCREMENT, so the highest ID is the latest scan
+_SQL_SELECT_LATEST_SCAN = 'SELECT data, data_format FROM frequency_scans ORDER BY id DESC LIMIT 1'
+
+# Conflicting config pairs are kept in device_conflicts, one row per pair
+# with config1_id < config2_id. Triggers on wireless_configs recompute only
+# the pairs involving the changed config, so reads never redo the self-join.
+_SQL_CONFLICT_TRIGGER_BODY = '''
+    DELETE FROM device_conflicts WHERE config1_id = NEW.id OR config2_id = NEW.id;
+    INSERT INTO device_conflicts (config1_id, config2_id, frequency, overlap)
+    SELECT MIN(NEW.id, w.id), MAX(NEW.id, w.id), NEW.frequency,
+           MIN(NEW.frequency + COALESCE(NEW.channel_width, 0) / 2.0,
+               w.frequency + COALESCE(w.channel_width, 0) / 2.0)
+         - MAX(NEW.frequency - COALESCE(NEW.channel_width, 0) / 2.0,
+               w.frequency - COALESCE(w.channel_width, 0) / 2.0)
+    FROM wireless_configs w
+    WHERE NEW.frequency IS NOT NULL AND NEW.frequency != 0
+      AND w.frequency = NEW.frequency AND w.id != NEW.id
+      AND NEW.frequency - COALESCE(NEW.channel_width, 0) / 2.0
+          <= w.frequency + COALESCE(w.channel_width, 0) / 2.0
+      AND NEW.frequency + COALESCE(NEW.channel_width, 0) / 2.0
+          >= w.frequency - COALESCE(w.channel_width, 0) / 2.0;
+'''
+
+# INSERT OR REPLACE does not fire DELETE triggers, so the insert trigger
+# clears any pairs left over from the row it replaced
+_SQL_CREATE_CONFLICT_TRIGGERS = (
+    f'''
+    CREATE TRIGGER IF NOT EXISTS trg_wc_conflicts_insert
+    AFTER INSERT ON wireless_configs
+    BEGIN {_SQL_CONFLICT_TRIGGER_BODY} END
+    ''',
+    f'''
+    CREATE TRIGGER IF NOT EXISTS trg_wc_conflicts_update
+    AFTER UPDATE ON wireless_configs
+    BEGIN
+        DELETE FROM device_conflicts WHERE config1_id = OLD.id OR config2_id = OLD.id;
+        {_SQL_CONFLICT_TRIGGER_BODY}
+    END
+    ''',
+    '''
+    CREATE TRIGGER IF NOT EXISTS trg_wc_conflicts_delete
+    AFTER DELETE ON wireless_configs
+    BEGIN
+        DELETE FROM device_conflicts WHERE config1_id = OLD.id OR config2_id = OLD.id;
+    END
+    '''
+)
+
+# Fills device_conflicts for databases created before it existed, by
+# pairing up configs sharing a frequency in a single self-join
+_SQL_BACKFILL_CONFLICTS = '''
+INSERT INTO device_conflicts (config1_id, config2_id, frequency, overlap)
+WITH ranges AS (
+    SELECT w.id, w.frequency,
+           w.frequency - COALESCE(w.channel_width, 0) / 2.0 AS freq_min,
+           w.frequency + COALESCE(w.channel_width, 0) / 2.0 AS freq_max
+    FROM wireless_configs w
+    WHERE w.frequency IS NOT NULL AND w.frequency != 0
+)
+SELECT a.id, b.id, a.frequency,
+       MIN(a.freq_max, b.freq_max) - MAX(a.freq_min, b.freq_min)
+FROM ranges a
+JOIN ranges b
+  ON a.frequency = b.frequency AND a.id < b.id
+ AND a.freq_min <= b.freq_max AND a.freq_max >= b.freq_min
+'''
+
+# Conflicts in the order a scan of wireless_configs meets them: frequencies
+# by their first config (counting only configs with a device), and within a
+# frequency, pairs by the rowids of their configs. device1 is the config that
+# was stored first, whatever the order of the ids in device_conflicts.
+_SQL_SELECT_CONFLICTS = '''
+WITH pairs AS (
+    SELECT MIN(a.rowid, b.rowid) AS rowid1, MAX(a.rowid, b.rowid) AS rowid2,
+           c.frequency, c.overlap
+    FROM device_conflicts c
+    JOIN wireless_configs a ON a.id = c.config1_id
+    JOIN wireless_configs b ON b.id = c.config2_id
+),
+first_configs AS (
+    SELECT w.frequency, MIN(w.rowid) AS first_rowid
+    FROM wireless_configs w
+    JOIN devices d ON d.id = w.device_id
+    WHERE w.frequency IN (SELECT frequency FROM device_conflicts)
+    GROUP BY w.frequency
+)
+SELECT d1.id, d1.name, d1.site_id,
+       d2.id, d2.name, d2.site_id,
+       p.frequency, p.overlap
+FROM pairs p
+JOIN first_configs f ON f.frequency = p.frequency
+JOIN wireless_configs w1 ON w1.rowid = p.rowid1
+JOIN wireless_configs w2 ON w2.rowid = p.rowid2
+JOIN devices d1 ON d1.id = w1.device_id
+JOIN devices d2 ON d2.id = w2.device_id
+ORDER BY f.first_rowid, p.rowid1, p.rowid2
+'''
+
+# Wireless configs joined to their devices, in the order the frequency report
+# lists them. Configs whose device is unknown keep NULL device columns so
+# their frequency still appears in the report.
+_SQL_SELECT_FREQUENCY_ALLOCATION = '''
+SELECT w.frequency, d.id, COALESCE(d.name, 'Unknown'), COALESCE(d.model, 'Unknown'),
+       d.site_id, w.ssid, w.channel_width, w.tx_power
+FROM wireless_configs w
+LEFT JOIN devices d ON d.id = w.device_id
+WHERE w.frequency IS NOT NULL AND w.frequency != 0
+ORDER BY w.frequency, w.rowid
+'''
+
+# Sites joined to their devices, one row per device (or a single row with
+# NULL device columns for a site without devices)
+_SQL_SELECT_SITE_DEVICES = '''
+SELECT s.id, COALESCE(s.name, 'Unknown'), s.latitude, s.longitude, s.elevation,
+       d.id, COALESCE(d.name, 'Unknown'), COALESCE(d.model, 'Unknown')
+FROM sites s
+LEFT JOIN devices d ON d.site_id = s.id
+ORDER BY s.rowid, d.rowid
+'''
+
+_SQL_COUNT_RECORDS = '''
+SELECT (SELECT COUNT(*) FROM devices),
+       (SELECT COUNT(*) FROM sites),
+       (SELECT COUNT(*) FROM wireless_configs)
+'''
+
 class FrequencyDatabase:
     """Database handler for frequency management data"""
     
@@ -29,18 +219,42 @@ class FrequencyDatabase:
             db_path: Path to SQLite database file
         """
         self.db_path = db_path
+        # Bumped on every write through this instance; see get_data_version()
+        self._write_count = 0
+        self.conn = self._connect()
         self._initialize_db()
     
-    def _get_connection(self):
-        """Get database connection"""
-        return sqlite3.connect(self.db_path)
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+    
+    def _connect(self) -> sqlite3.Connection:
+        """Open the persistent database connection shared by all methods"""
+        # Dash callbacks run on worker threads, so the connection must not be
+        # tied to the thread that created it
+        conn = sqlite3.connect(self.db_path, check_same_thread=False)
+        
+        # WAL journaling lets readers proceed during writes; under WAL,
+        # synchronous=NORMAL only syncs at checkpoints instead of every commit
+        conn.execute('PRAGMA journal_mode=WAL')
+        conn.execute('PRAGMA synchronous=NORMAL')
+        # 64 MiB page cache, kept warm across calls
+        conn.execute('PRAGMA cache_size=-65536')
+        return conn
+    
+    def close(self):
+        """Close the database connection"""
+        self.conn.close()
     
     def _initialize_db(self):
         """Initialize database schema if it doesn't exist"""
-        conn = self._get_connection()
-        cursor = conn.cursor()
+        cursor = self.conn.cursor()
         
-        # Create tables
+        # Create tables. last_updated and timestamp hold Unix time in
+        # milliseconds; older databases may still contain ISO-8601 text
+        # in rows written before the switch
         cursor.execute('''
         CREATE TABLE IF NOT EXISTS devices (
             id TEXT PRIMARY KEY,
@@ -48,8 +262,7 @@ class FrequencyDatabase:
             model TEXT,
             type TEXT,
             site_id TEXT,
-            data JSON,
-            last_updated TIMESTAMP
+            last_updated INTEGER
         )
         ''')
         
@@ -60,8 +273,7 @@ class FrequencyDatabase:
             latitude REAL,
             longitude REAL,
             elevation REAL,
-            data JSON,
-            last_updated TIMESTAMP
+            last_updated INTEGER
         )
         ''')
         
@@ -73,8 +285,7 @@ class FrequencyDatabase:
             frequency INTEGER,
             channel_width INTEGER,
             tx_power REAL,
-            data JSON,
-            last_updated TIMESTAMP,
+            last_updated INTEGER,
             FOREIGN KEY (device_id) REFERENCES devices (id)
         )
         ''')
@@ -82,216 +293,311 @@ class FrequencyDatabase:
         cursor.execute('''
         CREATE TABLE IF NOT EXISTS frequency_scans (
             id INTEGER PRIMARY KEY AUTOINCREMENT,
-            timestamp TIMESTAMP,
-            data JSON
+            timestamp INTEGER,
+            data BLOB,
+            data_format INTEGER NOT NULL DEFAULT 1
         )
         ''')
         
-        conn.commit()
-        conn.close()
+        # Databases created before scans were compressed lack data_format;
+        # their existing rows are plain JSON text
+        scan_columns = [row[1] for row in cursor.execute('PRAGMA table_info(frequency_scans)')]
+        if 'data_format' not in scan_columns:
+            cursor.execute(
+                f'ALTER TABLE frequency_scans ADD COLUMN data_format INTEGER NOT NULL DEFAULT {SCAN_FORMAT_JSON}'
+            )
+        
+        # Index used to find configs sharing a frequency when computing conflicts
+        cursor.execute('''
+        CREATE INDEX IF NOT EXISTS idx_wc_freq ON wireless_configs (frequency)
+        ''')
+        
+        # Indexes for per-device and per-site lookups
+        cursor.execute('''
+        CREATE INDEX IF NOT EXISTS idx_wc_device ON wireless_configs (device_id)
+        ''')
+        
+        cursor.execute('''
+        CREATE INDEX IF NOT EXISTS idx_dev_site ON devices (site_id)
+        ''')
+        
+        # Materialized conflict pairs, maintained by triggers on wireless_configs
+        has_conflicts_table = cursor.execute(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'device_conflicts'"
+        ).fetchone() is not None
+        
+        cursor.execute('''
+        CREATE TABLE IF NOT EXISTS device_conflicts (
+            config1_id TEXT NOT NULL,
+            config2_id TEXT NOT NULL,
+            frequency INTEGER,
+            overlap REAL,
+            PRIMARY KEY (config1_id, config2_id)
+        )
+        ''')
+        
+        cursor.execute('''
+        CREATE INDEX IF NOT EXISTS idx_conflicts_config2 ON device_conflicts (config2_id)
+        ''')
+        
+        for statement in _SQL_CREATE_CONFLICT_TRIGGERS:
+            cursor.execute(statement)
+        
+        if not has_conflicts_table:
+            cursor.execute(_SQL_BACKFILL_CONFLICTS)
+        
+        self.conn.commit()
         logger.info(f"Database initialized at {self.db_path}")
     
-    def store_devices(self, devices: List[Dict]):
+    def store_devices(self, devices: List[Dict], timestamp: Optional[int] = None):
         """
         Store device data in database
         
         Args:
             devices: List of device dictionaries
+            timestamp: Unix time in milliseconds (default: now)
         """
-        conn = self._get_connection()
-        cursor = conn.cursor()
-        timestamp = datetime.now().isoformat()
-        
-        for device in devices:
-            device_id = device.get('id')
-            if not device_id:
-                continue
-                
-            cursor.execute(
-                '''
-                INSERT OR REPLACE INTO devices 
-                (id, name, model, type, site_id, data, last_updated)
-                VALUES (?, ?, ?, ?, ?, ?, ?)
-                ''',
-                (
-                    device_id,
-                    device.get('name', 'Unknown'),
-                    device.get('model', 'Unknown'),
-                    device.get('type', 'Unknown'),
-                    device.get('siteId'),
-                    json.dumps(device),
-                    timestamp
-                )
+        if timestamp is None:
+            timestamp = int(time.time() * 1000)
+        rows = [
+            (
+                device['id'],
+                device.get('name', 'Unknown'),
+                device.get('model', 'Unknown'),
+                device.get('type', 'Unknown'),
+                device.get('siteId'),
+                timestamp
             )
-        
-        conn.commit()
-        conn.close()
-        logger.info(f"Stored {len(devices)} devices in database")
+            for device in devices
+            if device.get('id')
+        ]
+        
+        with self.conn:
+            self.conn.executemany(_SQL_INSERT_DEVICE, rows)
+        self._write_count += 1
+        self._log_stored(len(rows), len(devices), 'devices')
     
-    def store_sites(self, sites: List[Dict]):
+    def store_sites(self, sites: List[Dict], timestamp: Optional[int] = None):
         """
         Store site data in database
         
         Args:
             sites: List of site dictionaries
+            timestamp: Unix time in milliseconds (default: now)
         """
-        conn = self._get_connection()
-        cursor = conn.cursor()
-        timestamp = datetime.now().isoformat()
-        
-        for site in sites:
-            site_id = site.get('id')
-            if not site_id:
-                continue
-                
-            cursor.execute(
-                '''
-                INSERT OR REPLACE INTO sites 
-                (id, name, latitude, longitude, elevation, data, last_updated)
-                VALUES (?, ?, ?, ?, ?, ?, ?)
-                ''',
-                (
-                    site_id,
-                    site.get('name', 'Unknown'),
-                    site.get('latitude'),
-                    site.get('longitude'),
-                    site.get('elevation'),
-                    json.dumps(site),
-                    timestamp
-                )
+        if timestamp is None:
+            timestamp = int(time.time() * 1000)
+        rows = [
+            (
+                site['id'],
+                site.get('name', 'Unknown'),
+                site.get('latitude'),
+                site.get('longitude'),
+                site.get('elevation'),
+                timestamp
             )
-        
-        conn.commit()
-        conn.close()
-        logger.info(f"Stored {len(sites)} sites in database")
+            for site in sites
+            if site.get('id')
+        ]
+        
+        with self.conn:
+            self.conn.executemany(_SQL_INSERT_SITE, rows)
+        self._write_count += 1
+        self._log_stored(len(rows), len(sites), 'sites')
     
-    def store_wireless_configs(self, configs: List[Dict]):
+    def store_wireless_configs(self, configs: List[Dict], timestamp: Optional[int] = None):
         """
         Store wireless configuration data in database
         
         Args:
             configs: List of wireless configuration dictionaries
+            timestamp: Unix time in milliseconds (default: now)
         """
-        conn = self._get_connection()
-        cursor = conn.cursor()
-        timestamp = datetime.now().isoformat()
-        
-        for config in configs:
-            config_id = config.get('id')
-            device_id = config.get('deviceId')
-            if not config_id or not device_id:
-                continue
-                
-            cursor.execute(
-                '''
-                INSERT OR REPLACE INTO wireless_configs 
-                (id, device_id, ssid, frequency, channel_width, tx_power, data, last_updated)
-                VALUES (?, ?, ?, ?, ?, ?, ?, ?)
-                ''',
-                (
-                    config_id,
-                    device_id,
-                    config.get('ssid'),
-                    config.get('frequency'),
-                    config.get('channelWidth'),
-                    config.get('txPower'),
-                    json.dumps(config),
-                    timestamp
-                )
+        if timestamp is None:
+            timestamp = int(time.time() * 1000)
+        rows = [
+            (
+                config['id'],
+                config['deviceId'],
+                config.get('ssid'),
+                config.get('frequency'),
+                config.get('channelWidth'),
+                config.get('txPower'),
+                timestamp
             )
+            for config in configs
+            if config.get('id') and config.get('deviceId')
+        ]
+        
+        with self.conn:
+            self.conn.executemany(_SQL_INSERT_WCFG, rows)
+        self._write_count += 1
+        self._log_stored(len(rows), len(configs), 'wireless configurations')
+    
+    def get_data_version(self) -> str:
+        """
+        Get a token that changes whenever the stored data changes
         
-        conn.commit()
-        conn.close()
-        logger.info(f"Stored {len(configs)} wireless configurations in database")
+        Returns:
+            Opaque version string, suitable as a cache key
+        """
+        # data_version only changes for commits made by other connections,
+        # so combine it with the count of this instance's own writes
+        data_version = self.conn.execute('PRAGMA data_version').fetchone()[0]
+        return f"{data_version}.{self._write_count}"
     
-    def store_frequency_scan(self, scan_data: Dict):
+    def _log_stored(self, stored: int, received: int, label: str):
+        """
+        Log how many records were stored and how many were rejected
+        
+        Args:
+            stored: Number of rows written
+            received: Number of records passed in
+            label: Human-readable record type
+        """
+        logger.info(f"Stored {stored} {label} in database")
+        if stored < received:
+            logger.warning(f"Skipped {received - stored} {label} missing required IDs")
+    
+    def store_frequency_scan(self, scan_data: Dict, timestamp: Optional[int] = None):
         """
         Store a complete frequency scan in database
         
         Args:
             scan_data: Dictionary containing frequency scan data
+            timestamp: Unix time in milliseconds (default: now)
         """
-        conn = self._get_connection()
-        cursor = conn.cursor()
-        timestamp = datetime.now().isoformat()
+        if timestamp is None:
+            timestamp = int(time.time() * 1000)
         
-        cursor.execute(
-            '''
-            INSERT INTO frequency_scans 
-            (timestamp, data)
-            VALUES (?, ?)
-            ''',
-            (
-                timestamp,
-                json.dumps(scan_data)
+        with self.conn:
+            cursor = self.conn.execute(
+                _SQL_INSERT_SCAN,
+                (
+                    timestamp,
+                    self._encode_scan(scan_data),
+                    SCAN_FORMAT_ZSTD
+                )
             )
-        )
+        
+        self._write_count += 1
         
         scan_id = cursor.lastrowid
-        conn.commit()
-        conn.close()
         logger.info(f"Stored frequency scan with ID {scan_id} in database")
         return scan_id
     
-    def get_devices(self):
+    def get_devices(self, fields: Optional[List[str]] = None):
         """
         Get all devices from database
         
+        Args:
+            fields: Optional list of device fields to read (default: all)
+        
         Returns:
             List of device dictionaries
         """
-        conn = self._get_connection()
-        cursor = conn.cursor()
-        
-        cursor.execute('SELECT data FROM devices')
-        rows = cursor.fetchall()
-        
-        devices = []
-        for row in rows:
-            devices.append(json.loads(row[0]))
-        
-        conn.close()
-        return devices
+        return self._get_projected('devices', DEVICE_COLUMNS, fields)
     
-    def get_sites(self):
+    def get_sites(self, fields: Optional[List[str]] = None):
         """
         Get all sites from database
         
+        Args:
+            fields: Optional list of site fields to read (default: all)
+        
         Returns:
             List of site dictionaries
         """
-        conn = self._get_connection()
-        cursor = conn.cursor()
-        
-        cursor.execute('SELECT data FROM sites')
-        rows = cursor.fetchall()
-        
-        sites = []
-        for row in rows:
-            sites.append(json.loads(row[0]))
-        
-        conn.close()
-        return sites
+        return self._get_projected('sites', SITE_COLUMNS, fields)
     
-    def get_wireless_configs(self):
+    def get_wireless_configs(self, fields: Optional[List[str]] = None):
         """
         Get all wireless configurations from database
         
+        Args:
+            fields: Optional list of configuration fields to read (default: all)
+        
         Returns:
             List of wireless configuration dictionaries
         """
-        conn = self._get_connection()
-        cursor = conn.cursor()
+        return self._get_projected('wireless_configs', WIRELESS_CONFIG_COLUMNS, fields)
+    
+    def _get_projected(
+        self,
+        table: str,
+        column_map: Dict[str, str],
+        fields: Optional[List[str]] = None,
+        where: str = '',
+        params: tuple = ()
+    ) -> List[Dict]:
+        """
+        Rebuild dictionaries from a table's typed columns
         
-        cursor.execute('SELECT data FROM wireless_configs')
-        rows = cursor.fetchall()
+        Args:
+            table: Table name
+            column_map: Mapping of API field names to column names
+            fields: API field names to read (default: all mapped fields)
+            where: Optional SQL WHERE clause
+            params: Parameters for the WHERE clause
+            
+        Returns:
+            List of dictionaries keyed by API field name. NULL columns are
+            omitted, matching fields that were absent from the API data.
+        """
+        fields = fields or list(column_map)
+        unknown = [field for field in fields if field not in column_map]
+        if unknown:
+            raise ValueError(f"Unknown fields for {table}: {', '.join(unknown)}")
+        
+        columns = ', '.join(column_map[field] for field in fields)
+        
+        cursor = self.conn.cursor()
+        cursor.execute(f'SELECT {columns} FROM {table} {where}', params)
+        
+        return [
+            {field: value for field, value in zip(fields, row) if value is not None}
+            for row in cursor.fetchall()
+        ]
+    
+    def _encode_scan(self, scan_data: Dict) -> bytes:
+        """
+        Encode a frequency scan for storage
         
-        configs = []
-        for row in rows:
-            configs.append(json.loads(row[0]))
+        Args:
+            scan_data: Dictionary containing frequency scan data
+            
+        Returns:
+            zstd-compressed JSON bytes
+        """
+        # Serialize the scan one top-level section at a time straight into
+        # the compressor, so the full uncompressed JSON never exists in memory
+        buffer = io.BytesIO()
+        compressor = zstandard.ZstdCompressor(level=SCAN_COMPRESSION_LEVEL)
+        with compressor.stream_writer(buffer, closefd=False) as stream:
+            writer = JsonStreamWriter(stream)
+            writer.begin_object()
+            for key, value in scan_data.items():
+                writer.write_value(value, key=key)
+            writer.end_object()
+        
+        return buffer.getvalue()
+    
+    def _decode_scan(self, data: Union[bytes, str], data_format: int) -> Dict:
+        """
+        Decode a stored frequency scan
         
-        conn.close()
-        return configs
+        Args:
+            data: Stored scan payload
+            data_format: Payload encoding (SCAN_FORMAT_JSON or SCAN_FORMAT_ZSTD)
+            
+        Returns:
+            Dictionary containing frequency scan data
+        """
+        if data_format == SCAN_FORMAT_ZSTD:
+            # Streamed frames do not record their content size, which the
+            # one-shot decompress() requires
+            data = zstandard.ZstdDecompressor().decompressobj().decompress(data)
+        return orjson.loads(data)
     
     def get_frequency_scan(self, scan_id: int):
         """
@@ -303,16 +609,13 @@ class FrequencyDatabase:
         Returns:
             Dictionary containing frequency scan data
         """
-        conn = self._get_connection()
-        cursor = conn.cursor()
+        cursor = self.conn.cursor()
         
-        cursor.execute('SELECT data FROM frequency_scans WHERE id = ?', (scan_id,))
+        cursor.execute(_SQL_SELECT_SCAN, (scan_id,))
         row = cursor.fetchone()
         
-        conn.close()
-        
         if row:
-            return json.loads(row[0])
+            return self._decode_scan(*row)
         return None
     
     def get_latest_frequency_scan(self):
@@ -322,16 +625,13 @@ class FrequencyDatabase:
         Returns:
             Dictionary containing frequency scan data
         """
-        conn = self._get_connection()
-        cursor = conn.cursor()
+        cursor = self.conn.cursor()
         
-        cursor.execute('SELECT data FROM frequency_scans ORDER BY timestamp DESC LIMIT 1')
+        cursor.execute(_SQL_SELECT_LATEST_SCAN)
         row = cursor.fetchone()
         
-        conn.close()
-        
         if row:
-            return json.loads(row[0])
+            return self._decode_scan(*row)
         return None
     
     def get_frequency_data_for_device(self, device_id: str):
@@ -344,28 +644,18 @@ class FrequencyDatabase:
         Returns:
             Dictionary containing device and its frequency data
         """
-        conn = self._get_connection()
-        cursor = conn.cursor()
-        
-        cursor.execute('''
-        SELECT d.data, w.data 
-        FROM devices d
-        LEFT JOIN wireless_configs w ON d.id = w.device_id
-        WHERE d.id = ?
-        ''', (device_id,))
-        
-        row = cursor.fetchone()
-        conn.close()
-        
-        if not row:
+        devices = self._get_projected('devices', DEVICE_COLUMNS, where='WHERE id = ?', params=(device_id,))
+        if not devices:
             return None
-            
-        device_data = json.loads(row[0])
-        wireless_data = json.loads(row[1]) if row[1] else None
+        
+        configs = self._get_projected(
+            'wireless_configs', WIRELESS_CONFIG_COLUMNS,
+            where='WHERE device_id = ? LIMIT 1', params=(device_id,)
+        )
         
         return {
-            'device': device_data,
-            'wireless_config': wireless_data
+            'device': devices[0],
+            'wireless_config': configs[0] if configs else None
         }
     
     def get_devices_by_site(self, site_id: str):
@@ -378,101 +668,79 @@ class FrequencyDatabase:
         Returns:
             List of device dictionaries
         """
-        conn = self._get_connection()
-        cursor = conn.cursor()
+        return self._get_projected('devices', DEVICE_COLUMNS, where='WHERE site_id = ?', params=(site_id,))
+    
+    def get_record_counts(self) -> Dict[str, int]:
+        """
+        Count the stored devices, sites and wireless configurations
         
-        cursor.execute('SELECT data FROM devices WHERE site_id = ?', (site_id,))
-        rows = cursor.fetchall()
+        Returns:
+            Dictionary of record counts keyed by record type
+        """
+        devices, sites, wireless_configs = self.conn.execute(_SQL_COUNT_RECORDS).fetchone()
+        return {
+            'devices': devices,
+            'sites': sites,
+            'wireless_configs': wireless_configs
+        }
+    
+    def get_frequency_allocation_rows(self) -> List[tuple]:
+        """
+        Get wireless configurations joined to their devices, ordered by frequency
         
-        devices = []
-        for row in rows:
-            devices.append(json.loads(row[0]))
+        Returns:
+            List of (frequency, device_id, device_name, device_model, site_id,
+            ssid, channel_width, tx_power) tuples. Device columns are None
+            when the configuration's device is not stored.
+        """
+        return self.conn.execute(_SQL_SELECT_FREQUENCY_ALLOCATION).fetchall()
+    
+    def get_site_device_rows(self) -> List[tuple]:
+        """
+        Get sites joined to their devices, ordered by site
         
-        conn.close()
-        return devices
+        Returns:
+            List of (site_id, site_name, latitude, longitude, elevation,
+            device_id, device_name, device_model) tuples. A site without
+            devices has a single row with device_id None.
+        """
+        return self.conn.execute(_SQL_SELECT_SITE_DEVICES).fetchall()
     
     def get_frequency_conflicts(self):
         """
         Identify potential frequency conflicts between devices
         
+        Conflicts are read from the device_conflicts table, which triggers
+        keep up to date as wireless configurations are stored.
+        
         Returns:
             List of conflict dictionaries
         """
-        conn = self._get_connection()
-        cursor = conn.cursor()
+        cursor = self.conn.cursor()
         
-        # Get all wireless configs with frequency data
-        cursor.execute('''
-        SELECT d.id, d.name, d.site_id, w.frequency, w.channel_width
-        FROM devices d
-        JOIN wireless_configs w ON d.id = w.device_id
-        WHERE w.frequency IS NOT NULL
-        ''')
+        cursor.execute(_SQL_SELECT_CONFLICTS)
         
         rows = cursor.fetchall()
-        conn.close()
         
-        # Group devices by frequency
-        frequency_map = {}
-        for row in rows:
-            device_id, device_name, site_id, frequency, channel_width = row
-            
-            if not frequency:
-                continue
-                
-            # Calculate frequency range
-            half_width = (channel_width or 0) / 2
-            freq_min = frequency - half_width
-            freq_max = frequency + half_width
-            
-            device_info = {
-                'id': device_id,
-                'name': device_name,
-                'site_id': site_id,
+        return [
+            {
+                'device1': {
+                    'id': device1_id,
+                    'name': device1_name,
+                    'site_id': device1_site_id
+                },
+                'device2': {
+                    'id': device2_id,
+                    'name': device2_name,
+                    'site_id': device2_site_id
+                },
                 'frequency': frequency,
-                'channel_width': channel_width,
-                'freq_min': freq_min,
-                'freq_max': freq_max
+                'overlap': overlap
             }
-            
-            if frequency not in frequency_map:
-                frequency_map[frequency] = []
-            
-            frequency_map[frequency].append(device_info)
-        
-        # Identify conflicts
-        conflicts = []
-        for frequency, devices in frequency_map.items():
-            if len(devices) < 2:
-                continue
-                
-            # Check for overlaps
-            for i in range(len(devices)):
-                for j in range(i+1, len(devices)):
-                    device1 = devices[i]
-                    device2 = devices[j]
-                    
-                    # Check if frequency ranges overlap
-                    if (device1['freq_min'] <= device2['freq_max'] and 
-                        device1['freq_max'] >= device2['freq_min']):
-                        
-                        conflicts.append({
-                            'device1': {
-                                'id': device1['id'],
-                                'name': device1['name'],
-                                'site_id': device1['site_id']
-                            },
-                            'device2': {
-                                'id': device2['id'],
-                                'name': device2['name'],
-                                'site_id': device2['site_id']
-                            },
-                            'frequency': frequency,
-                            'overlap': min(device1['freq_max'], device2['freq_max']) - 
-                                      max(device1['freq_min'], device2['freq_min'])
-                        })
-        
-        return conflicts
+            for (device1_id, device1_name, device1_site_id,
+                 device2_id, device2_name, device2_site_id,
+                 frequency, overlap) in rows
+        ]
 
 
 def create_database(db_path: str = 'frequency_data.db'):
@@ -6,17 +6,11 @@ This module provides visualization of frequency data using Plotly and Dash.
 
 import os
 import sys
-import json
 import logging
 import pandas as pd
 import numpy as np
 from typing import Dict, List, Any, Optional, Union
 import plotly.graph_objects as go
-import plotly.express as px
-from plotly.subplots import make_subplots
-import dash
-from dash import dcc, html, Input, Output, State
-import dash_bootstrap_components as dbc
 
 from frequency_database import FrequencyDatabase
 
@@ -27,6 +21,33 @@ logging.basicConfig(
 )
 logger = logging.getLogger('frequency_visualization')
 
+# Seconds a dashboard figure stays cached; entries are also keyed by the
+# database's data version, so new data is picked up immediately
+FIGURE_CACHE_TIMEOUT = 60
+
+# Output file extensions exported as static images rather than HTML
+STATIC_IMAGE_EXTENSIONS = ('.png', '.svg', '.pdf')
+
+
+def _write_figure(fig: go.Figure, output_file: str):
+    """
+    Save a figure, as a static image or a standalone HTML file
+    
+    Args:
+        fig: Plotly figure object
+        output_file: Output file path; .png, .svg and .pdf are rendered as
+            images (requires kaleido), anything else is written as HTML
+    """
+    if os.path.splitext(output_file)[1].lower() in STATIC_IMAGE_EXTENSIONS:
+        # Rasterizing skips serializing the figure into an interactive page
+        fig.write_image(output_file)
+        return
+    
+    # Load plotly.js from its CDN instead of embedding the ~3 MB bundle in
+    # every file; the charts use no LaTeX, so MathJax is left out too
+    fig.write_html(output_file, include_plotlyjs='cdn', include_mathjax=False)
+
+
 class FrequencyVisualizer:
     """Visualizes frequency data using Plotly"""
     
@@ -38,6 +59,75 @@ class FrequencyVisualizer:
             database: Initialized frequency database
         """
         self.database = database
+        # (data version, chart table)
+        self._chart_df_cache = (None, None)
+    
+    def _get_chart_df(self) -> pd.DataFrame:
+        """
+        Get the chart table, rebuilding it only when the data changes
+        
+        The cached DataFrame is shared between calls and must not be
+        modified in place.
+        
+        Returns:
+            DataFrame as built by _build_chart_df()
+        """
+        version = self.database.get_data_version()
+        cached_version, df = self._chart_df_cache
+        if cached_version != version:
+            df = self._build_chart_df()
+            self._chart_df_cache = (version, df)
+        return df
+    
+    def _build_chart_df(self) -> pd.DataFrame:
+        """
+        Build the per-configuration frequency table shared by the charts
+        
+        Returns:
+            DataFrame with one row per wireless configuration that has a
+            device, frequency and channel width (empty if there are none)
+        """
+        configs_df = pd.DataFrame(
+            self.database.get_wireless_configs(fields=['deviceId', 'frequency', 'channelWidth', 'ssid']),
+            columns=['deviceId', 'frequency', 'channelWidth', 'ssid']
+        )
+        
+        # Keep configs whose device, frequency and width are all set and non-zero
+        required = configs_df[['deviceId', 'frequency', 'channelWidth']]
+        configs_df = configs_df[required.fillna(0).astype(bool).all(axis=1)]
+        
+        # Missing values made these columns float; restore integer MHz values.
+        # Integer columns stay int64, which Plotly narrows to the smallest
+        # fitting type when serializing; fractional values fit in float32
+        for column in ('frequency', 'channelWidth'):
+            values = configs_df[column]
+            if values.dtype.kind == 'f' and (values % 1 == 0).all():
+                configs_df[column] = values.astype('int64')
+            elif values.dtype.kind == 'f':
+                configs_df[column] = values.astype('float32')
+        
+        devices_df = pd.DataFrame(
+            self.database.get_devices(fields=['id', 'name', 'type', 'siteId']),
+            columns=['id', 'name', 'type', 'siteId']
+        )
+        
+        df = configs_df.merge(devices_df, how='left', left_on='deviceId', right_on='id')
+        
+        # Calculate frequency range
+        half_width = df['channelWidth'] / 2
+        
+        return pd.DataFrame({
+            'device_id': df['deviceId'],
+            'device_name': df['name'].fillna('Unknown'),
+            # Few distinct values repeat across many rows, so store as categories
+            'device_type': df['type'].fillna('Unknown').astype('category'),
+            'site_id': df['siteId'],
+            'frequency': df['frequency'],
+            'channel_width': df['channelWidth'],
+            'freq_min': (df['frequency'] - half_width).astype('float32'),
+            'freq_max': (df['frequency'] + half_width).astype('float32'),
+            'ssid': df['ssid'].fillna('').astype('category')
+        })
     
     def create_frequency_chart(self, output_file: Optional[str] = None) -> go.Figure:
         """
@@ -49,50 +139,9 @@ class FrequencyVisualizer:
         Returns:
             Plotly figure object
         """
-        # Get data from database
-        wireless_configs = self.database.get_wireless_configs()
-        devices = self.database.get_devices()
-        
-        # Create device lookup
-        device_map = {}
-        for device in devices:
-            device_id = device.get('id')
-            if device_id:
-                device_map[device_id] = device
-        
-        # Prepare data for visualization
-        chart_data = []
-        for config in wireless_configs:
-            device_id = config.get('deviceId')
-            frequency = config.get('frequency')
-            channel_width = config.get('channelWidth')
-            
-            if not device_id or not frequency or not channel_width:
-                continue
-            
-            device = device_map.get(device_id, {})
-            device_name = device.get('name', 'Unknown')
-            device_type = device.get('type', 'Unknown')
-            site_id = device.get('siteId')
-            
-            # Calculate frequency range
-            half_width = channel_width / 2
-            freq_min = frequency - half_width
-            freq_max = frequency + half_width
-            
-            chart_data.append({
-                'device_id': device_id,
-                'device_name': device_name,
-                'device_type': device_type,
-                'site_id': site_id,
-                'frequency': frequency,
-                'channel_width': channel_width,
-                'freq_min': freq_min,
-                'freq_max': freq_max,
-                'ssid': config.get('ssid', '')
-            })
-        
-        if not chart_data:
+        df = self._get_chart_df()
+        
+        if df.empty:
             logger.warning("No frequency data available for visualization")
             fig = go.Figure()
             fig.add_annotation(
@@ -104,31 +153,35 @@ class FrequencyVisualizer:
             )
             return fig
         
-        # Convert to DataFrame for easier manipulation
-        df = pd.DataFrame(chart_data)
-        
-        # Sort by frequency
-        df = df.sort_values('frequency')
+        # Order devices along the x axis by their lowest frequency; only the
+        # axis order matters, so the rows themselves are left unsorted
+        device_order = df.groupby('device_name', sort=False)['frequency'].min().sort_values(kind='stable')
         
         # Create figure
         fig = go.Figure()
         
-        # Add frequency bands for each device
-        for _, row in df.iterrows():
-            fig.add_trace(go.Bar(
-                x=[row['device_name']],
-                y=[row['channel_width']],
-                base=[row['freq_min']],
-                name=f"{row['device_name']} ({row['frequency']} MHz)",
-                hovertemplate=(
-                    f"<b>{row['device_name']}</b><br>" +
-                    f"Frequency: {row['frequency']} MHz<br>" +
-                    f"Channel Width: {row['channel_width']} MHz<br>" +
-                    f"Range: {row['freq_min']} - {row['freq_max']} MHz<br>" +
-                    f"SSID: {row['ssid']}<br>" +
-                    f"Device Type: {row['device_type']}"
-                )
-            ))
+        # Add all frequency bands as a single trace; per-band details ride
+        # along in customdata for the hover text
+        fig.add_trace(go.Bar(
+            x=df['device_name'],
+            y=df['channel_width'],
+            base=df['freq_min'],
+            customdata=df[['frequency', 'channel_width', 'freq_min', 'freq_max', 'ssid', 'device_type']].to_numpy(),
+            marker=dict(
+                color=df['frequency'],
+                colorscale='Viridis',
+                colorbar=dict(title="Frequency (MHz)")
+            ),
+            name="Devices",
+            hovertemplate=(
+                "<b>%{x}</b><br>" +
+                "Frequency: %{customdata[0]} MHz<br>" +
+                "Channel Width: %{customdata[1]} MHz<br>" +
+                "Range: %{customdata[2]} - %{customdata[3]} MHz<br>" +
+                "SSID: %{customdata[4]}<br>" +
+                "Device Type: %{customdata[5]}<extra></extra>"
+            )
+        ))
         
         # Update layout
         fig.update_layout(
@@ -137,14 +190,14 @@ class FrequencyVisualizer:
             yaxis_title="Frequency (MHz)",
             barmode='overlay',
             bargap=0.25,
-            legend_title="Devices",
+            xaxis=dict(categoryorder='array', categoryarray=list(device_order.index)),
             height=800,
             margin=dict(l=50, r=50, t=100, b=100)
         )
         
         # Save to file if specified
         if output_file:
-            fig.write_html(output_file)
+            _write_figure(fig, output_file)
             logger.info(f"Frequency chart saved to {output_file}")
         
         return fig
@@ -174,28 +227,27 @@ class FrequencyVisualizer:
             )
             return fig
         
-        # Extract unique devices
-        devices = set()
-        for conflict in conflicts:
-            devices.add(conflict['device1']['name'])
-            devices.add(conflict['device2']['name'])
-        
-        devices = sorted(list(devices))
+        # Collect both device names of every conflict, then derive the sorted
+        # unique devices and each name's matrix index in a single factorize
+        n_conflicts = len(conflicts)
+        names = [conflict['device1']['name'] for conflict in conflicts]
+        names += [conflict['device2']['name'] for conflict in conflicts]
+        codes, devices = pd.factorize(np.array(names, dtype=object), sort=True, use_na_sentinel=False)
+        devices = list(devices)
         n_devices = len(devices)
+        i, j = codes[:n_conflicts], codes[n_conflicts:]
+        overlaps = np.fromiter(
+            (conflict['overlap'] for conflict in conflicts),
+            dtype=np.float64,
+            count=n_conflicts
+        )
         
-        # Create device index mapping
-        device_indices = {device: i for i, device in enumerate(devices)}
-        
-        # Initialize matrix
+        # Fill matrix with conflict data, making it symmetric. Devices with
+        # several configs can conflict more than once, so keep the largest
+        # overlap per pair rather than whichever conflict came last
         matrix = np.zeros((n_devices, n_devices))
-        
-        # Fill matrix with conflict data
-        for conflict in conflicts:
-            i = device_indices[conflict['device1']['name']]
-            j = device_indices[conflict['device2']['name']]
-            # Make matrix symmetric
-            matrix[i, j] = conflict['overlap']
-            matrix[j, i] = conflict['overlap']
+        np.maximum.at(matrix, (i, j), overlaps)
+        np.maximum.at(matrix, (j, i), overlaps)
         
         # Create heatmap
         fig = go.Figure(data=go.Heatmap(
@@ -222,7 +274,7 @@ class FrequencyVisualizer:
         
         # Save to file if specified
         if output_file:
-            fig.write_html(output_file)
+            _write_figure(fig, output_file)
             logger.info(f"Conflict matrix saved to {output_file}")
         
         return fig
@@ -237,48 +289,9 @@ class FrequencyVisualizer:
         Returns:
             Plotly figure object
         """
-        # Get data from database
-        wireless_configs = self.database.get_wireless_configs()
-        devices = self.database.get_devices()
-        
-        # Create device lookup
-        device_map = {}
-        for device in devices:
-            device_id = device.get('id')
-            if device_id:
-                device_map[device_id] = device
-        
-        # Prepare data for visualization
-        chart_data = []
-        for config in wireless_configs:
-            device_id = config.get('deviceId')
-            frequency = config.get('frequency')
-            channel_width = config.get('channelWidth')
-            
-            if not device_id or not frequency or not channel_width:
-                continue
-            
-            device = device_map.get(device_id, {})
-            device_name = device.get('name', 'Unknown')
-            device_type = device.get('type', 'Unknown')
-            
-            # Calculate frequency range
-            half_width = channel_width / 2
-            freq_min = frequency - half_width
-            freq_max = frequency + half_width
-            
-            chart_data.append({
-                'device_id': device_id,
-                'device_name': device_name,
-                'device_type': device_type,
-                'frequency': frequency,
-                'channel_width': channel_width,
-                'freq_min': freq_min,
-                'freq_max': freq_max,
-                'ssid': config.get('ssid', '')
-            })
-        
-        if not chart_data:
+        df = self._get_chart_df()
+        
+        if df.empty:
             logger.warning("No frequency data available for visualization")
             fig = go.Figure()
             fig.add_annotation(
@@ -290,23 +303,26 @@ class FrequencyVisualizer:
             )
             return fig
         
-        # Convert to DataFrame for easier manipulation
-        df = pd.DataFrame(chart_data)
-        
         # Create frequency range
         freq_range = np.linspace(
             df['freq_min'].min() - 50,
             df['freq_max'].max() + 50,
-            1000
+            1000,
+            dtype=np.float32
         )
         
-        # Calculate spectrum density
-        spectrum = np.zeros_like(freq_range)
+        # Calculate spectrum density. Each band covers the sample points in
+        # [freq_min, freq_max]; mark where coverage starts and stops, then a
+        # prefix sum over the markers gives the overlap count at every point
+        starts = np.searchsorted(freq_range, df['freq_min'].to_numpy(), side='left')
+        ends = np.searchsorted(freq_range, df['freq_max'].to_numpy(), side='right')
+        ends = np.maximum(ends, starts)
         
-        for _, row in df.iterrows():
-            # Create a simple rectangular filter for each frequency band
-            mask = (freq_range >= row['freq_min']) & (freq_range <= row['freq_max'])
-            spectrum[mask] += 1
+        delta = (
+            np.bincount(starts, minlength=len(freq_range) + 1)
+            - np.bincount(ends, minlength=len(freq_range) + 1)
+        )
+        spectrum = np.cumsum(delta)[:-1]
         
         # Create figure
         fig = go.Figure()
@@ -353,7 +369,7 @@ class FrequencyVisualizer:
         
         # Save to file if specified
         if output_file:
-            fig.write_html(output_file)
+            _write_figure(fig, output_file)
             logger.info(f"Frequency spectrum saved to {output_file}")
         
         return fig
@@ -369,6 +385,12 @@ class FrequencyDashboard:
         Args:
             database: Initialized frequency database
         """
+        # Dash and its extensions are only needed for the interactive
+        # dashboard, so they are imported here rather than at module load
+        import dash
+        import dash_bootstrap_components as dbc
+        from flask_caching import Cache
+        
         self.database = database
         self.visualizer = FrequencyVisualizer(database)
         self.app = dash.Dash(
@@ -376,11 +398,15 @@ class FrequencyDashboard:
             external_stylesheets=[dbc.themes.BOOTSTRAP],
             title="NYC Mesh Frequency Management"
         )
+        self.cache = Cache(self.app.server, config={'CACHE_TYPE': 'SimpleCache'})
         self._setup_layout()
         self._setup_callbacks()
     
     def _setup_layout(self):
         """Set up the dashboard layout"""
+        from dash import dcc, html
+        import dash_bootstrap_components as dbc
+        
         self.app.layout = dbc.Container([
             dbc.Row([
                 dbc.Col([
@@ -451,7 +477,8 @@ class FrequencyDashboard:
                                         "Refresh Data",
                                         id="refresh-button",
                                         color="secondary"
-                                    )
+                                    ),
+                                    html.Div(id="export-status", className="mt-2 text-muted")
                                 ])
                             ])
                         ])
@@ -525,22 +552,20 @@ class FrequencyDashboard:
     
     def _setup_callbacks(self):
         """Set up the dashboard callbacks"""
-        
-        @self.app.callback(
-            Output("device-type-filter", "options"),
-            Input("refresh-button", "n_clicks")
-        )
-        def update_device_type_options(n_clicks):
-            """Update device type filter options"""
-            devices = self.database.get_devices()
-            device_types = set()
-            
-            for device in devices:
-                device_type = device.get('type')
-                if device_type:
-                    device_types.add(device_type)
-            
-            return [{"label": dtype, "value": dtype} for dtype in sorted(device_types)]
+        import dash
+        from dash import Input, Output, State
+
+        @self.cache.memoize(timeout=FIGURE_CACHE_TIMEOUT)
+        def build_figure(viz_type, data_version):
+            """Build a visualization, memoized per data version"""
+            if viz_type == "allocation":
+                return self.visualizer.create_frequency_chart()
+            elif viz_type == "conflicts":
+                return self.visualizer.create_conflict_matrix()
+            elif viz_type == "spectrum":
+                return self.visualizer.create_frequency_spectrum()
+            else:
+                return go.Figure()
         
         @self.app.callback(
             Output("frequency-visualization", "figure"),
@@ -553,37 +578,20 @@ class FrequencyDashboard:
         )
         def update_visualization(viz_type, device_types, freq_range, n_clicks):
             """Update the visualization based on user selections"""
-            if viz_type == "allocation":
-                return self.visualizer.create_frequency_chart()
-            elif viz_type == "conflicts":
-                return self.visualizer.create_conflict_matrix()
-            elif viz_type == "spectrum":
-                return self.visualizer.create_frequency_spectrum()
-            else:
-                return go.Figure()
+            return build_figure(viz_type, self.database.get_data_version())
         
         @self.app.callback(
-            Output("conflict-summary", "children"),
+            [
+                Output("device-type-filter", "options"),
+                Output("conflict-summary", "children")
+            ],
             Input("refresh-button", "n_clicks")
         )
-        def update_conflict_summary(n_clicks):
-            """Update the conflict summary"""
-            conflicts = self.database.get_frequency_conflicts()
-            
-            if not conflicts:
-                return html.P("No frequency conflicts detected.")
-            
-            return html.Div([
-                html.P(f"Detected {len(conflicts)} potential frequency conflicts:"),
-                html.Ul([
-                    html.Li([
-                        f"{conflict['device1']['name']} and {conflict['device2']['name']} ",
-                        f"at {conflict['frequency']} MHz ",
-                        f"(overlap: {conflict['overlap']:.1f} MHz)"
-                    ]) for conflict in conflicts[:10]  # Show first 10 conflicts
-                ]),
-                html.P(f"... and {len(conflicts) - 10} more conflicts") if len(conflicts) > 10 else None
-            ])
+        def refresh_data(n_clicks):
+            """Update the device type filter options and the conflict summary"""
+            # Both outputs depend only on the refresh button, so they share a
+            # single callback round-trip
+            return self._device_type_options(), self._conflict_summary()
         
         @self.app.callback(
             Output("export-modal", "is_open"),
@@ -608,7 +616,7 @@ class FrequencyDashboard:
             return is_open
         
         @self.app.callback(
-            Output("loading-visualization", "children"),
+            Output("export-status", "children"),
             [Input("export-confirm", "n_clicks")],
             [
                 State("visualization-type", "value"),
@@ -617,14 +625,9 @@ class FrequencyDashboard:
         )
         def export_visualization(n_clicks, viz_type, filename):
             """Export the current visualization"""
+            # Exporting only writes a file; the displayed graph is left alone
             if n_clicks is None:
-                return [
-                    dcc.Graph(
-                        id="frequency-visualization",
-                        figure=go.Figure(),
-                        style={"height": "700px"}
-                    )
-                ]
+                return dash.no_update
             
             if not filename:
                 filename = "frequency_visualization.html"
@@ -636,13 +639,45 @@ class FrequencyDashboard:
             elif viz_type == "spectrum":
                 self.visualizer.create_frequency_spectrum(output_file=filename)
             
-            return [
-                dcc.Graph(
-                    id="frequency-visualization",
-                    figure=go.Figure(),
-                    style={"height": "700px"}
-                )
-            ]
+            return f"Visualization exported to {filename}"
+    
+    def _device_type_options(self) -> List[Dict]:
+        """
+        Build the device type filter options
+        
+        Returns:
+            List of dropdown option dictionaries
+        """
+        devices = self.database.get_devices(fields=['type'])
+        device_types = {device['type'] for device in devices if device.get('type')}
+        
+        return [{"label": dtype, "value": dtype} for dtype in sorted(device_types)]
+    
+    def _conflict_summary(self):
+        """
+        Build the conflict summary panel
+        
+        Returns:
+            Dash component summarizing detected conflicts
+        """
+        from dash import html
+        
+        conflicts = self.database.get_frequency_conflicts()
+        
+        if not conflicts:
+            return html.P("No frequency conflicts detected.")
+        
+        return html.Div([
+            html.P(f"Detected {len(conflicts)} potential frequency conflicts:"),
+            html.Ul([
+                html.Li([
+                    f"{conflict['device1']['name']} and {conflict['device2']['name']} ",
+                    f"at {conflict['frequency']} MHz ",
+                    f"(overlap: {conflict['overlap']:.1f} MHz)"
+                ]) for conflict in conflicts[:10]  # Show first 10 conflicts
+            ]),
+            html.P(f"... and {len(conflicts) - 10} more conflicts") if len(conflicts) > 10 else None
+        ])
     
     def run_server(self, debug=False, port=8050):
         """Run the dashboard server"""
@@ -655,7 +690,7 @@ def main():
     
     parser = argparse.ArgumentParser(description='NYC Mesh Frequency Visualization')
     parser.add_argument('--db', default='frequency_data.db', help='Database file path')
-    parser.add_argument('--output', help='Output file for static visualization')
+    parser.add_argument('--output', help='Output file for static visualization (.html, .png, .svg or .pdf)')
     parser.add_argument('--type', choices=['allocation', 'conflicts', 'spectrum'], 
                         default='allocation', help='Visualization type')
     parser.add_argument('--dashboard', action='store_true', help='Run interactive dashboard')
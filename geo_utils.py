@@ -0,0 +1,78 @@
+#!/usr/bin/env python3
+"""
+Geographic Helpers Module for NYC Mesh Frequency Management Tool
+This module provides vectorized great-circle distance and bearing calculations.
+"""
+
+import numpy as np
+
+# Mean Earth radius in meters
+EARTH_RADIUS_M = 6371000.0
+
+
+def _haversine(phi1, phi2, dlam, cos_phi1, cos_phi2):
+    """
+    Haversine distance from coordinates already converted to radians
+    
+    Args:
+        phi1: Latitude(s) of the first points in radians
+        phi2: Latitude(s) of the second points in radians
+        dlam: Longitude difference(s) in radians
+        cos_phi1: Cosine of phi1
+        cos_phi2: Cosine of phi2
+        
+    Returns:
+        Distance(s) in meters
+    """
+    a = np.sin((phi2 - phi1) / 2) ** 2 + cos_phi1 * cos_phi2 * np.sin(dlam / 2) ** 2
+    return 2 * EARTH_RADIUS_M * np.arcsin(np.sqrt(a))
+
+
+def haversine_distance(lat1, lon1, lat2, lon2):
+    """
+    Calculate great-circle distances between points
+    
+    Args:
+        lat1: Latitude(s) of the first points in degrees
+        lon1: Longitude(s) of the first points in degrees
+        lat2: Latitude(s) of the second points in degrees
+        lon2: Longitude(s) of the second points in degrees
+        
+    Returns:
+        Distance(s) in meters, as a NumPy array for array inputs
+    """
+    phi1 = np.radians(lat1)
+    phi2 = np.radians(lat2)
+    dlam = np.radians(lon2) - np.radians(lon1)
+    return _haversine(phi1, phi2, dlam, np.cos(phi1), np.cos(phi2))
+
+
+def distance_and_bearing(lat1, lon1, lat2, lon2):
+    """
+    Calculate great-circle distances and initial bearings between points
+    
+    Both come from one pass over the coordinates, sharing the trigonometry.
+    
+    Args:
+        lat1: Latitude(s) of the first points in degrees
+        lon1: Longitude(s) of the first points in degrees
+        lat2: Latitude(s) of the second points in degrees
+        lon2: Longitude(s) of the second points in degrees
+        
+    Returns:
+        Tuple of (distances in meters, bearings from the first to the second
+        points in degrees clockwise from north)
+    """
+    phi1 = np.radians(lat1)
+    phi2 = np.radians(lat2)
+    dlam = np.radians(lon2) - np.radians(lon1)
+    cos_phi1 = np.cos(phi1)
+    cos_phi2 = np.cos(phi2)
+    
+    distance = _haversine(phi1, phi2, dlam, cos_phi1, cos_phi2)
+    bearing = np.degrees(np.arctan2(
+        np.sin(dlam) * cos_phi2,
+        cos_phi1 * np.sin(phi2) - np.sin(phi1) * cos_phi2 * np.cos(dlam)
+    )) % 360
+    
+    return distance, bearing
@@ -5,24 +5,23 @@ This module provides map-based visualization of device locations and interferenc
 """
 
 import os
-import sys
-import json
+import re
+import gzip
 import logging
+import tempfile
+import threading
+from collections import defaultdict
+from dataclasses import dataclass
+from concurrent.futures import ThreadPoolExecutor
+import orjson
 import pandas as pd
 import numpy as np
-from typing import Dict, List, Any, Optional, Union
-import plotly.graph_objects as go
-import plotly.express as px
-from plotly.subplots import make_subplots
-import dash
-from dash import dcc, html, Input, Output, State
-import dash_bootstrap_components as dbc
+from typing import Dict, List, Any, Iterator, Optional, Tuple, Union
 import folium
-from folium.plugins import MarkerCluster, HeatMap
-import math
-import geopy.distance
+from folium.plugins import FastMarkerCluster, HeatMap
 
-from frequency_database import FrequencyDatabase
+from frequency_database import FrequencyDatabase, DEVICE_COLUMNS, WIRELESS_CONFIG_COLUMNS
+from geo_utils import EARTH_RADIUS_M, haversine_distance
 
 # Configure logging
 logging.basicConfig(
@@ -31,6 +30,211 @@ logging.basicConfig(
 )
 logger = logging.getLogger('geographical_positioning')
 
+# Site fields the maps need
+SITE_FIELDS = ['id', 'name', 'latitude', 'longitude']
+
+# Conflicts between sites farther apart than this (meters) are not drawn
+MAX_INTERFERENCE_RANGE_M = 10000
+
+# Interference zones whose centers are closer than this (meters) are merged
+ZONE_MERGE_RADIUS_M = 100
+
+# Number of segments used to draw a sector's arc
+SECTOR_ARC_POINTS = 20
+
+# Distance in degrees that device markers are drawn from their site
+DEVICE_MARKER_OFFSET = 0.0001
+
+# Angle between successive device markers around a site (golden angle, radians)
+GOLDEN_ANGLE = np.pi * (3 - np.sqrt(5))
+
+# Device map marker colors by device type (other types are green)
+DEVICE_TYPE_COLORS = {'ap': 'red', 'station': 'orange'}
+
+# Shared result for snapshot lookups of devices without a record (read-only)
+_EMPTY = {}
+
+# Map types, with the visualizer method that builds each one and the file
+# name it is saved under on the command line
+MAP_BUILDERS = {
+    'devices': ('create_device_map', 'device_map.html'),
+    'sectors': ('create_sector_coverage_map', 'sector_map.html'),
+    'interference': ('create_interference_zone_map', 'interference_map.html'),
+    'heatmap': ('create_frequency_heatmap', 'heatmap.html')
+}
+
+# URL path the dashboard serves generated map files from
+MAP_ROUTE = '/maps/'
+
+# gzip level for generated dashboard maps, which are compressed once per
+# data version and then served as-is
+MAP_COMPRESSION_LEVEL = 6
+
+# Write buffer for map HTML files (1 MiB)
+MAP_WRITE_BUFFER_SIZE = 1 << 20
+
+# Request threads per dashboard worker process when served by gunicorn
+SERVER_THREADS = 8
+
+# Download name for exported maps when none is given
+DEFAULT_EXPORT_FILENAME = 'nyc_mesh_map.html'
+
+# Characters replaced in client-supplied export file names
+UNSAFE_FILENAME_CHARS = re.compile(r'[^A-Za-z0-9_.-]')
+
+# Builds a device map marker in the browser from a
+# [latitude, longitude, popup HTML, tooltip, marker color, glyphicon] row
+MARKER_CALLBACK = """
+function (row) {
+    var icon = L.AwesomeMarkers.icon({
+        markerColor: row[4], iconColor: 'white', icon: row[5], prefix: 'glyphicon'
+    });
+    var marker = L.marker(new L.LatLng(row[0], row[1]), {icon: icon});
+    marker.bindPopup(row[2], {maxWidth: '100%'});
+    marker.bindTooltip(row[3], {sticky: true});
+    return marker;
+}
+"""
+
+
+def iter_map_html(m: folium.Map) -> Iterator[str]:
+    """
+    Render a map's HTML document piece by piece
+    
+    Folium's Figure.render() joins every element's output into one string
+    for each of the header, body and script sections and then again for
+    the whole document. This follows the same layout but yields each
+    element's output on its own, so the document is never held in memory.
+    
+    Args:
+        m: Folium map object
+        
+    Yields:
+        Consecutive pieces of the HTML document
+    """
+    figure = m.get_root()
+    
+    # Rendering the figure's children fills in its header, body and script
+    for child in figure._children.values():
+        child.render()
+    
+    yield '<!DOCTYPE html>\n<html>\n<head>\n'
+    if figure.title:
+        yield f'<title>{figure.title}</title>'
+    for section, closing in (
+        (figure.header, '\n</head>\n<body>\n'),
+        (figure.html, '\n</body>\n<script>\n'),
+        (figure.script, '\n</script>\n</html>')
+    ):
+        yield '    '
+        yield from section._template.generate(this=section, kwargs={})
+        yield closing
+
+
+def save_map(m: folium.Map, output_file: str):
+    """
+    Write a map's HTML document to a file without rendering it to one string
+    
+    Args:
+        m: Folium map object
+        output_file: Output file path
+    """
+    with open(output_file, 'w', encoding='utf8', buffering=MAP_WRITE_BUFFER_SIZE) as f:
+        f.writelines(iter_map_html(m))
+
+
+def group_nearby_points(points: np.ndarray, radius: float) -> List[List[int]]:
+    """
+    Group points that lie within a radius of a group's first point
+    
+    Args:
+        points: Array of (latitude, longitude) rows in degrees
+        radius: Grouping radius in meters
+        
+    Returns:
+        Lists of point indices, one per group, ordered by first point
+    """
+    if len(points) == 0:
+        return []
+    
+    # Only the interference map groups points, so the other maps and the
+    # command line do not pay for importing scipy at module load
+    from scipy.spatial import cKDTree
+    
+    # An equirectangular projection is accurate enough at city scale
+    phi = np.radians(points[:, 0])
+    xy = EARTH_RADIUS_M * np.column_stack([
+        np.radians(points[:, 1]) * np.cos(phi.mean()),
+        phi
+    ])
+    neighbors = cKDTree(xy).query_ball_point(xy, r=radius)
+    
+    assigned = np.zeros(len(points), dtype=bool)
+    groups = []
+    for index, nearby in enumerate(neighbors):
+        if assigned[index]:
+            continue
+        members = sorted(other for other in nearby if not assigned[other])
+        assigned[members] = True
+        groups.append(members)
+    return groups
+
+
+def sector_outlines(lats, lons, radii, directions, widths) -> np.ndarray:
+    """
+    Calculate the outlines of sectors
+    
+    Args:
+        lats: Latitudes of the sector centers in degrees
+        lons: Longitudes of the sector centers in degrees
+        radii: Sector radii in meters
+        directions: Sector directions in degrees (0 = North, 90 = East, etc.)
+        widths: Sector widths in degrees
+        
+    Returns:
+        Array of shape (sectors, SECTOR_ARC_POINTS + 3, 2) holding each
+        sector's (latitude, longitude) outline, which starts and ends at
+        its center
+    """
+    # One row per sector, one column per arc point
+    lats, lons, radii, directions, widths = (
+        np.asarray(values, dtype=np.float64)[:, np.newaxis]
+        for values in (lats, lons, radii, directions, widths)
+    )
+    
+    # Bearings of the arc points, in degrees clockwise from North
+    start_angles = (directions - (widths / 2)) % 360
+    theta = np.radians(start_angles + np.arange(SECTOR_ARC_POINTS + 1) * (widths / SECTOR_ARC_POINTS))
+    
+    # Spherical destination from each center along each bearing
+    phi1 = np.radians(lats)
+    delta = radii / EARTH_RADIUS_M
+    phi2 = np.arcsin(np.sin(phi1) * np.cos(delta) + np.cos(phi1) * np.sin(delta) * np.cos(theta))
+    lam2 = np.radians(lons) + np.arctan2(
+        np.sin(theta) * np.sin(delta) * np.cos(phi1),
+        np.cos(delta) - np.sin(phi1) * np.sin(phi2)
+    )
+    
+    outlines = np.empty((len(lats), SECTOR_ARC_POINTS + 3, 2))
+    outlines[:, [0, -1], 0] = lats
+    outlines[:, [0, -1], 1] = lons
+    outlines[:, 1:-1, 0] = np.degrees(phi2)
+    outlines[:, 1:-1, 1] = np.degrees(lam2)
+    return outlines
+
+@dataclass
+class MapSnapshot:
+    """Data class for the database records shared by the map builders"""
+    sites_df: pd.DataFrame  # Sites with valid coordinates
+    site_by_id: Dict[str, Dict]
+    center: Optional[Tuple[float, float]]  # Mean site location, None without sites
+    devices_df: pd.DataFrame
+    configs_df: pd.DataFrame
+    device_map: Dict[str, Dict]  # Devices by device ID
+    wireless_map: Dict[str, Dict]  # Wireless configurations by device ID
+    devices_by_site: Dict[str, List[Dict]]
+    conflicts: List[Dict]  # As returned by FrequencyDatabase.get_frequency_conflicts()
+
 class GeoPositioningVisualizer:
     """Visualizes geographical positioning of devices and interference zones"""
     
@@ -42,6 +246,67 @@ class GeoPositioningVisualizer:
             database: Initialized frequency database
         """
         self.database = database
+        # (data version, map snapshot), and a lock so maps built concurrently
+        # share one rebuild
+        self._snapshot_cache = (None, None)
+        self._snapshot_lock = threading.Lock()
+    
+    def _get_snapshot(self) -> MapSnapshot:
+        """
+        Get the map snapshot, rebuilding it only when the data changes
+        
+        The cached snapshot is shared between calls and must not be
+        modified in place.
+        
+        Returns:
+            MapSnapshot as built by _build_snapshot()
+        """
+        with self._snapshot_lock:
+            version = self.database.get_data_version()
+            cached_version, snapshot = self._snapshot_cache
+            if cached_version != version:
+                snapshot = self._build_snapshot()
+                self._snapshot_cache = (version, snapshot)
+        return snapshot
+    
+    def _build_snapshot(self) -> MapSnapshot:
+        """
+        Read everything the map builders use and index it
+        
+        Returns:
+            MapSnapshot of the current database contents
+        """
+        devices = self.database.get_devices()
+        wireless_configs = self.database.get_wireless_configs()
+        
+        # Sites without coordinates can't be placed on a map
+        sites_df = pd.DataFrame(
+            self.database.get_sites(fields=SITE_FIELDS),
+            columns=SITE_FIELDS
+        ).dropna(subset=['latitude', 'longitude'])
+        sites_df = sites_df.assign(name=sites_df['name'].fillna('Unknown Site'))
+        
+        devices_by_site = defaultdict(list)
+        for device in devices:
+            devices_by_site[device.get('siteId')].append(device)
+        
+        coordinates = sites_df[['latitude', 'longitude']].to_numpy()
+        
+        return MapSnapshot(
+            sites_df=sites_df,
+            site_by_id=sites_df.set_index('id', drop=False).to_dict('index'),
+            center=tuple(coordinates.mean(axis=0).tolist()) if len(coordinates) else None,
+            devices_df=pd.DataFrame(devices, columns=list(DEVICE_COLUMNS)),
+            configs_df=pd.DataFrame(wireless_configs, columns=list(WIRELESS_CONFIG_COLUMNS)),
+            device_map={device['id']: device for device in devices if device.get('id')},
+            # The last configuration stored for a device wins
+            wireless_map={
+                config['deviceId']: config
+                for config in wireless_configs if config.get('deviceId')
+            },
+            devices_by_site=dict(devices_by_site),
+            conflicts=self.database.get_frequency_conflicts()
+        )
     
     def create_device_map(self, output_file: Optional[str] = None) -> folium.Map:
         """
@@ -54,67 +319,47 @@ class GeoPositioningVisualizer:
             Folium map object
         """
         # Get data from database
-        sites = self.database.get_sites()
-        devices = self.database.get_devices()
-        wireless_configs = self.database.get_wireless_configs()
+        snapshot = self._get_snapshot()
+        sites_df = snapshot.sites_df
+        site_by_id = snapshot.site_by_id
+        devices_by_site = snapshot.devices_by_site
+        wireless_map = snapshot.wireless_map
         
-        # Create device lookup
-        device_map = {}
-        for device in devices:
-            device_id = device.get('id')
-            if device_id:
-                device_map[device_id] = device
-        
-        # Create wireless config lookup
-        wireless_map = {}
-        for config in wireless_configs:
-            device_id = config.get('deviceId')
-            if device_id:
-                wireless_map[device_id] = config
-        
-        # Filter sites with valid coordinates
-        valid_sites = []
-        for site in sites:
-            lat = site.get('latitude')
-            lon = site.get('longitude')
-            if lat is not None and lon is not None:
-                valid_sites.append(site)
-        
-        if not valid_sites:
+        if sites_df.empty:
             logger.warning("No sites with valid coordinates found")
             # Create empty map centered on NYC
             m = folium.Map(location=[40.7128, -74.0060], zoom_start=12)
             
             if output_file:
-                m.save(output_file)
+                save_map(m, output_file)
                 logger.info(f"Empty map saved to {output_file}")
             
             return m
         
         # Calculate map center
-        lats = [site.get('latitude') for site in valid_sites]
-        lons = [site.get('longitude') for site in valid_sites]
-        center_lat = sum(lats) / len(lats)
-        center_lon = sum(lons) / len(lons)
+        center_lat, center_lon = snapshot.center
         
         # Create map
         m = folium.Map(location=[center_lat, center_lon], zoom_start=12)
         
-        # Create marker cluster for devices
-        marker_cluster = MarkerCluster().add_to(m)
+        # Spread each site's devices around it on a golden-angle spiral, so
+        # the n-th device of every site gets the same deterministic offset
+        max_site_devices = max(map(len, devices_by_site.values()), default=0)
+        steps = np.arange(max_site_devices) * GOLDEN_ANGLE
+        offsets = (DEVICE_MARKER_OFFSET * np.column_stack([np.sin(steps), np.cos(steps)])).tolist()
+        
+        # Marker rows for the clustered layer, in MARKER_CALLBACK's layout
+        markers = []
         
         # Add sites and their devices to map
-        for site in valid_sites:
+        for site in site_by_id.values():
             site_id = site.get('id')
             site_name = site.get('name', 'Unknown Site')
             lat = site.get('latitude')
             lon = site.get('longitude')
             
             # Get devices for this site
-            site_devices = []
-            for device in devices:
-                if device.get('siteId') == site_id:
-                    site_devices.append(device)
+            site_devices = devices_by_site.get(site_id, [])
             
             # Create site marker
             site_popup = f"""
@@ -124,22 +369,17 @@ class GeoPositioningVisualizer:
             Devices: {len(site_devices)}
             """
             
-            folium.Marker(
-                location=[lat, lon],
-                popup=site_popup,
-                tooltip=site_name,
-                icon=folium.Icon(color='blue', icon='info-sign')
-            ).add_to(marker_cluster)
+            markers.append([lat, lon, site_popup, site_name, 'blue', 'info-sign'])
             
             # Add device markers
-            for device in site_devices:
+            for index, device in enumerate(site_devices):
                 device_id = device.get('id')
                 device_name = device.get('name', 'Unknown Device')
                 device_model = device.get('model', 'Unknown Model')
                 device_type = device.get('type', 'Unknown Type')
                 
                 # Get wireless config for this device
-                wireless_config = wireless_map.get(device_id, {})
+                wireless_config = wireless_map.get(device_id, _EMPTY)
                 frequency = wireless_config.get('frequency')
                 channel_width = wireless_config.get('channelWidth')
                 
@@ -160,26 +400,23 @@ class GeoPositioningVisualizer:
                     """
                 
                 # Slightly offset device markers from site location
-                device_lat = lat + (0.0001 * (hash(device_id) % 10))
-                device_lon = lon + (0.0001 * (hash(device_id[::-1]) % 10))
+                offset_lat, offset_lon = offsets[index]
+                device_lat = lat + offset_lat
+                device_lon = lon + offset_lon
                 
                 # Determine icon color based on device type
-                icon_color = 'green'
-                if device_type == 'ap':
-                    icon_color = 'red'
-                elif device_type == 'station':
-                    icon_color = 'orange'
+                icon_color = DEVICE_TYPE_COLORS.get(device_type, 'green')
                 
-                folium.Marker(
-                    location=[device_lat, device_lon],
-                    popup=device_popup,
-                    tooltip=device_name,
-                    icon=folium.Icon(color=icon_color, icon='signal')
-                ).add_to(marker_cluster)
+                markers.append([
+                    device_lat, device_lon, device_popup, device_name, icon_color, 'signal'
+                ])
+        
+        # Markers are built and clustered in the browser from the rows
+        FastMarkerCluster(markers, callback=MARKER_CALLBACK).add_to(m)
         
         # Save to file if specified
         if output_file:
-            m.save(output_file)
+            save_map(m, output_file)
             logger.info(f"Device map saved to {output_file}")
         
         return m
@@ -195,64 +432,46 @@ class GeoPositioningVisualizer:
             Folium map object
         """
         # Get data from database
-        sites = self.database.get_sites()
-        devices = self.database.get_devices()
-        wireless_configs = self.database.get_wireless_configs()
-        
-        # Create device lookup
-        device_map = {}
-        for device in devices:
-            device_id = device.get('id')
-            if device_id:
-                device_map[device_id] = device
-        
-        # Create wireless config lookup
-        wireless_map = {}
-        for config in wireless_configs:
-            device_id = config.get('deviceId')
-            if device_id:
-                wireless_map[device_id] = config
-        
-        # Filter sites with valid coordinates
-        valid_sites = []
-        for site in sites:
-            lat = site.get('latitude')
-            lon = site.get('longitude')
-            if lat is not None and lon is not None:
-                valid_sites.append(site)
+        snapshot = self._get_snapshot()
+        sites_df = snapshot.sites_df
+        site_by_id = snapshot.site_by_id
+        devices_by_site = snapshot.devices_by_site
+        wireless_map = snapshot.wireless_map
         
-        if not valid_sites:
+        if sites_df.empty:
             logger.warning("No sites with valid coordinates found")
             # Create empty map centered on NYC
             m = folium.Map(location=[40.7128, -74.0060], zoom_start=12)
             
             if output_file:
-                m.save(output_file)
+                save_map(m, output_file)
                 logger.info(f"Empty map saved to {output_file}")
             
             return m
         
         # Calculate map center
-        lats = [site.get('latitude') for site in valid_sites]
-        lons = [site.get('longitude') for site in valid_sites]
-        center_lat = sum(lats) / len(lats)
-        center_lon = sum(lons) / len(lons)
+        center_lat, center_lon = snapshot.center
         
         # Create map
         m = folium.Map(location=[center_lat, center_lon], zoom_start=12)
         
+        # Markers and coverage shapes are collected in layers that are
+        # attached to the map once, instead of one map child per element
+        sites_layer = folium.FeatureGroup(name='Sites')
+        coverage_layer = folium.FeatureGroup(name='Sector coverage')
+        
+        # Directional sectors as (lat, lon, radius, direction, width, name, frequency)
+        sectors = []
+        
         # Add sites and sector coverage to map
-        for site in valid_sites:
+        for site in site_by_id.values():
             site_id = site.get('id')
             site_name = site.get('name', 'Unknown Site')
             lat = site.get('latitude')
             lon = site.get('longitude')
             
             # Get devices for this site
-            site_devices = []
-            for device in devices:
-                if device.get('siteId') == site_id:
-                    site_devices.append(device)
+            site_devices = devices_by_site.get(site_id, [])
             
             # Create site marker
             site_popup = f"""
@@ -267,7 +486,7 @@ class GeoPositioningVisualizer:
                 popup=site_popup,
                 tooltip=site_name,
                 icon=folium.Icon(color='blue', icon='info-sign')
-            ).add_to(m)
+            ).add_to(sites_layer)
             
             # Add sector coverage for AP devices
             for device in site_devices:
@@ -280,7 +499,7 @@ class GeoPositioningVisualizer:
                     continue
                 
                 # Get wireless config for this device
-                wireless_config = wireless_map.get(device_id, {})
+                wireless_config = wireless_map.get(device_id, _EMPTY)
                 frequency = wireless_config.get('frequency')
                 
                 if not frequency:
@@ -319,66 +538,51 @@ class GeoPositioningVisualizer:
                         color='red',
                         fill=True,
                         fill_opacity=0.2
-                    ).add_to(m)
+                    ).add_to(coverage_layer)
                 else:
-                    # Create a sector for directional coverage
-                    self._add_sector_to_map(
-                        m, lat, lon, radius, direction, sector_width, 
-                        device_name, frequency
+                    # Directional sectors are drawn together below
+                    sectors.append(
+                        (lat, lon, radius, direction, sector_width, device_name, frequency)
                     )
         
+        # Create sectors for directional coverage
+        self._add_sectors_to_map(coverage_layer, sectors)
+        
+        sites_layer.add_to(m)
+        coverage_layer.add_to(m)
+        
         # Save to file if specified
         if output_file:
-            m.save(output_file)
+            save_map(m, output_file)
             logger.info(f"Sector coverage map saved to {output_file}")
         
         return m
     
-    def _add_sector_to_map(self, m, lat, lon, radius, direction, width, name, frequency):
+    def _add_sectors_to_map(self, m, sectors):
         """
-        Add a sector coverage pattern to the map
+        Add sector coverage patterns to the map
         
         Args:
-            m: Folium map object
-            lat: Latitude of the sector center
-            lon: Longitude of the sector center
-            radius: Radius of the sector in meters
-            direction: Direction of the sector in degrees (0 = North, 90 = East, etc.)
-            width: Width of the sector in degrees
-            name: Name of the device
-            frequency: Frequency of the device
+            m: Folium map object or layer to add the sectors to
+            sectors: List of (latitude, longitude, radius in meters, direction
+                in degrees, width in degrees, device name, frequency) tuples
         """
-        # Calculate start and end angles
-        start_angle = (direction - (width / 2)) % 360
-        end_angle = (direction + (width / 2)) % 360
-        
-        # Generate points for the sector
-        points = []
-        
-        # Add center point
-        points.append((lat, lon))
-        
-        # Add arc points
-        num_points = 20
-        for i in range(num_points + 1):
-            angle_rad = math.radians(start_angle + (i * (width / num_points)))
-            # Calculate point at given angle and distance
-            point = geopy.distance.distance(meters=radius).destination(
-                (lat, lon), bearing=angle_rad
-            )
-            points.append((point.latitude, point.longitude))
+        if not sectors:
+            return
         
-        # Add center point again to close the polygon
-        points.append((lat, lon))
+        # Calculate every sector outline in one pass
+        lats, lons, radii, directions, widths, names, frequencies = zip(*sectors)
+        outlines = sector_outlines(lats, lons, radii, directions, widths)
         
-        # Create sector polygon
-        folium.Polygon(
-            locations=points,
-            popup=f"{name} ({frequency} MHz)",
-            color='red',
-            fill=True,
-            fill_opacity=0.2
-        ).add_to(m)
+        for outline, name, frequency in zip(outlines.tolist(), names, frequencies):
+            # Create sector polygon
+            folium.Polygon(
+                locations=outline,
+                popup=f"{name} ({frequency} MHz)",
+                color='red',
+                fill=True,
+                fill_opacity=0.2
+            ).add_to(m)
     
     def create_interference_zone_map(self, output_file: Optional[str] = None) -> folium.Map:
         """
@@ -391,63 +595,37 @@ class GeoPositioningVisualizer:
             Folium map object
         """
         # Get data from database
-        sites = self.database.get_sites()
-        devices = self.database.get_devices()
-        wireless_configs = self.database.get_wireless_configs()
-        conflicts = self.database.get_frequency_conflicts()
-        
-        # Create device lookup
-        device_map = {}
-        for device in devices:
-            device_id = device.get('id')
-            if device_id:
-                device_map[device_id] = device
-        
-        # Create wireless config lookup
-        wireless_map = {}
-        for config in wireless_configs:
-            device_id = config.get('deviceId')
-            if device_id:
-                wireless_map[device_id] = config
-        
-        # Filter sites with valid coordinates
-        valid_sites = []
-        for site in sites:
-            lat = site.get('latitude')
-            lon = site.get('longitude')
-            if lat is not None and lon is not None:
-                valid_sites.append(site)
+        snapshot = self._get_snapshot()
+        sites_df = snapshot.sites_df
+        site_by_id = snapshot.site_by_id
+        device_map = snapshot.device_map
+        conflicts = snapshot.conflicts
         
-        if not valid_sites:
+        if sites_df.empty:
             logger.warning("No sites with valid coordinates found")
             # Create empty map centered on NYC
             m = folium.Map(location=[40.7128, -74.0060], zoom_start=12)
             
             if output_file:
-                m.save(output_file)
+                save_map(m, output_file)
                 logger.info(f"Empty map saved to {output_file}")
             
             return m
         
         # Calculate map center
-        lats = [site.get('latitude') for site in valid_sites]
-        lons = [site.get('longitude') for site in valid_sites]
-        center_lat = sum(lats) / len(lats)
-        center_lon = sum(lons) / len(lons)
+        center_lat, center_lon = snapshot.center
         
         # Create map
         m = folium.Map(location=[center_lat, center_lon], zoom_start=12)
         
-        # Create site lookup
-        site_map = {}
-        for site in valid_sites:
-            site_id = site.get('id')
-            if site_id:
-                site_map[site_id] = site
+        # Markers, zones and links are collected in layers that are
+        # attached to the map once, instead of one map child per element
+        sites_layer = folium.FeatureGroup(name='Sites')
+        zones_layer = folium.FeatureGroup(name='Interference zones')
+        links_layer = folium.FeatureGroup(name='Conflict links')
         
         # Add sites to map
-        for site in valid_sites:
-            site_id = site.get('id')
+        for site in site_by_id.values():
             site_name = site.get('name', 'Unknown Site')
             lat = site.get('latitude')
             lon = site.get('longitude')
@@ -458,64 +636,104 @@ class GeoPositioningVisualizer:
                 popup=site_name,
                 tooltip=site_name,
                 icon=folium.Icon(color='blue', icon='info-sign')
-            ).add_to(m)
+            ).add_to(sites_layer)
         
-        # Add interference zones for conflicting devices
+        # Resolve each conflict to the pair of sites it spans
+        zones = []
         for conflict in conflicts:
             device1_id = conflict['device1']['id']
             device2_id = conflict['device2']['id']
             
             # Get site information for both devices
-            device1 = device_map.get(device1_id, {})
-            device2 = device_map.get(device2_id, {})
+            device1 = device_map.get(device1_id, _EMPTY)
+            device2 = device_map.get(device2_id, _EMPTY)
             
             site1_id = device1.get('siteId')
             site2_id = device2.get('siteId')
             
-            site1 = site_map.get(site1_id, {})
-            site2 = site_map.get(site2_id, {})
+            # Devices at the same site would get a zero-radius zone and a
+            # zero-length line, so there is nothing to draw
+            if site1_id == site2_id:
+                continue
+            
+            site1 = site_by_id.get(site1_id)
+            site2 = site_by_id.get(site2_id)
             
             # Skip if either site doesn't have valid coordinates
             if not site1 or not site2:
                 continue
-                
-            lat1 = site1.get('latitude')
-            lon1 = site1.get('longitude')
-            lat2 = site2.get('latitude')
-            lon2 = site2.get('longitude')
-            
-            if lat1 is None or lon1 is None or lat2 is None or lon2 is None:
-                continue
             
-            # Calculate midpoint between sites
-            mid_lat = (lat1 + lat2) / 2
-            mid_lon = (lon1 + lon2) / 2
-            
-            # Calculate distance between sites
-            distance = geopy.distance.distance((lat1, lon1), (lat2, lon2)).meters
+            zones.append((conflict, device1, device2, site1, site2))
+        
+        # Calculate all site-to-site distances in one pass
+        coords = np.array([
+            (site1['latitude'], site1['longitude'], site2['latitude'], site2['longitude'])
+            for _, _, _, site1, site2 in zones
+        ], dtype=np.float64).reshape(-1, 4)
+        distances = haversine_distance(*coords.T)
+        
+        # Conflicts between sites too far apart to interfere are not drawn
+        in_range = np.flatnonzero(distances <= MAX_INTERFERENCE_RANGE_M)
+        zones = [zones[index] for index in in_range]
+        coords = coords[in_range]
+        distances = distances[in_range]
+        
+        # Calculate midpoints between sites
+        midpoints = (coords[:, :2] + coords[:, 2:]) / 2
+        
+        # Zones whose midpoints nearly coincide are drawn as one circle
+        for members in group_nearby_points(midpoints, ZONE_MERGE_RADIUS_M):
+            mid_lat, mid_lon = midpoints[members[0]].tolist()
+            names = [
+                f"{zones[index][1].get('name')} and {zones[index][2].get('name')}"
+                for index in members
+            ]
+            if len(names) == 1:
+                popup = f"Potential interference zone between {names[0]}"
+            else:
+                popup = f"{len(names)} potential interference zones between:<br>" + '<br>'.join(names)
             
             # Create interference zone (circle at midpoint)
             folium.Circle(
                 location=[mid_lat, mid_lon],
-                radius=distance / 2,  # Use half the distance as radius
-                popup=f"Potential interference zone between {device1.get('name')} and {device2.get('name')}",
+                radius=float(distances[members].max()) / 2,  # Use half the distance as radius
+                popup=popup,
                 color='red',
                 fill=True,
                 fill_opacity=0.3
-            ).add_to(m)
+            ).add_to(zones_layer)
+        
+        # Conflicts between the same two sites share one line
+        site_pair_conflicts = defaultdict(list)
+        for conflict, device1, device2, site1, site2 in zones:
+            site_pair = tuple(sorted((site1['id'], site2['id'])))
+            site_pair_conflicts[site_pair].append(
+                f"{device1.get('name')} and {device2.get('name')} at {conflict['frequency']} MHz"
+            )
+        
+        for (site1_id, site2_id), descriptions in site_pair_conflicts.items():
+            site1 = site_by_id[site1_id]
+            site2 = site_by_id[site2_id]
             
             # Draw line between conflicting sites
             folium.PolyLine(
-                locations=[(lat1, lon1), (lat2, lon2)],
+                locations=[
+                    (site1['latitude'], site1['longitude']),
+                    (site2['latitude'], site2['longitude'])
+                ],
                 color='red',
                 weight=2,
                 opacity=0.7,
-                popup=f"Conflict: {device1.get('name')} and {device2.get('name')} at {conflict['frequency']} MHz"
-            ).add_to(m)
+                popup='Conflict: ' + '<br>Conflict: '.join(descriptions)
+            ).add_to(links_layer)
+        
+        sites_layer.add_to(m)
+        zones_layer.add_to(m)
+        links_layer.add_to(m)
         
         # Save to file if specified
         if output_file:
-            m.save(output_file)
+            save_map(m, output_file)
             logger.info(f"Interference zone map saved to {output_file}")
         
         return m
@@ -531,112 +749,57 @@ class GeoPositioningVisualizer:
             Folium map object
         """
         # Get data from database
-        sites = self.database.get_sites()
-        devices = self.database.get_devices()
-        wireless_configs = self.database.get_wireless_configs()
-        
-        # Create device lookup
-        device_map = {}
-        for device in devices:
-            device_id = device.get('id')
-            if device_id:
-                device_map[device_id] = device
-        
-        # Create wireless config lookup
-        wireless_map = {}
-        for config in wireless_configs:
-            device_id = config.get('deviceId')
-            if device_id:
-                wireless_map[device_id] = config
-        
-        # Filter sites with valid coordinates
-        valid_sites = []
-        for site in sites:
-            lat = site.get('latitude')
-            lon = site.get('longitude')
-            if lat is not None and lon is not None:
-                valid_sites.append(site)
+        snapshot = self._get_snapshot()
+        sites_df = snapshot.sites_df
+        devices_df = snapshot.devices_df[['id', 'siteId']].dropna()
+        # The last configuration stored for a device wins
+        configs_df = snapshot.configs_df[['deviceId', 'frequency']].drop_duplicates(
+            'deviceId', keep='last'
+        )
         
-        if not valid_sites:
+        if sites_df.empty:
             logger.warning("No sites with valid coordinates found")
             # Create empty map centered on NYC
             m = folium.Map(location=[40.7128, -74.0060], zoom_start=12)
             
             if output_file:
-                m.save(output_file)
+                save_map(m, output_file)
                 logger.info(f"Empty map saved to {output_file}")
             
             return m
         
         # Calculate map center
-        lats = [site.get('latitude') for site in valid_sites]
-        lons = [site.get('longitude') for site in valid_sites]
-        center_lat = sum(lats) / len(lats)
-        center_lon = sum(lons) / len(lons)
+        center_lat, center_lon = snapshot.center
         
         # Create map
         m = folium.Map(location=[center_lat, center_lon], zoom_start=12)
         
-        # Prepare heatmap data
-        heatmap_data = []
+        # Locate each configured device at its site
+        located = devices_df.merge(configs_df, left_on='id', right_on='deviceId').merge(
+            sites_df[['id', 'latitude', 'longitude']].rename(columns={'id': 'siteId'}),
+            on='siteId'
+        )
+        located = located[located['frequency'].fillna(0).astype(bool)]
         
-        # Group devices by frequency
-        frequency_groups = {}
-        
-        for device in devices:
-            device_id = device.get('id')
-            site_id = device.get('siteId')
-            
-            if not device_id or not site_id:
-                continue
-            
-            # Get site information
-            site = None
-            for s in valid_sites:
-                if s.get('id') == site_id:
-                    site = s
-                    break
-            
-            if not site:
-                continue
-            
-            # Get wireless config
-            wireless_config = wireless_map.get(device_id)
-            if not wireless_config:
-                continue
-            
-            frequency = wireless_config.get('frequency')
-            if not frequency:
-                continue
-            
-            # Round frequency to nearest 5 MHz for grouping
-            rounded_freq = round(frequency / 5) * 5
-            
-            if rounded_freq not in frequency_groups:
-                frequency_groups[rounded_freq] = []
-            
-            lat = site.get('latitude')
-            lon = site.get('longitude')
-            
-            if lat is not None and lon is not None:
-                frequency_groups[rounded_freq].append((lat, lon))
+        # Round frequency to nearest 5 MHz for grouping
+        located = located.assign(group=np.round(located['frequency'].to_numpy() / 5) * 5)
         
         # Create a separate heatmap layer for each frequency group
-        for frequency, points in frequency_groups.items():
-            if not points:
-                continue
-            
+        for frequency, group in located.groupby('group', sort=False):
             # Add points to heatmap data with weight based on frequency
             # Higher frequencies get higher weight (arbitrary choice for visualization)
             weight = (frequency - 5000) / 1000  # Normalize to 0-1 range for 5GHz band
             weight = max(0.1, min(1.0, weight))  # Clamp to 0.1-1.0 range
             
-            weighted_points = [[lat, lon, weight] for lat, lon in points]
+            weighted_points = np.column_stack([
+                group[['latitude', 'longitude']].to_numpy(),
+                np.full(len(group), weight)
+            ]).tolist()
             
             # Create heatmap layer
             heatmap = HeatMap(
                 weighted_points,
-                name=f"{frequency} MHz",
+                name=f"{int(frequency)} MHz",
                 radius=15,
                 blur=10,
                 gradient={0.4: 'blue', 0.65: 'lime', 0.8: 'yellow', 1.0: 'red'}
@@ -650,11 +813,97 @@ class GeoPositioningVisualizer:
         
         # Save to file if specified
         if output_file:
-            m.save(output_file)
+            save_map(m, output_file)
             logger.info(f"Frequency heatmap saved to {output_file}")
         
         return m
-
+    
+    def export_geojson(self, output_file: Optional[str] = None) -> bytes:
+        """
+        Export sites, devices and conflicts as a GeoJSON FeatureCollection
+        
+        Sites and devices are Point features at the site location, and each
+        conflict between located devices is a LineString between their
+        sites. Each feature's "kind" property is "site", "device" or
+        "conflict".
+        
+        Args:
+            output_file: Optional file path to save the GeoJSON
+            
+        Returns:
+            GeoJSON document as UTF-8 encoded JSON
+        """
+        snapshot = self._get_snapshot()
+        features = []
+        
+        for site in snapshot.site_by_id.values():
+            site_id = site['id']
+            site_devices = snapshot.devices_by_site.get(site_id, [])
+            point = {'type': 'Point', 'coordinates': [site['longitude'], site['latitude']]}
+            
+            features.append({
+                'type': 'Feature',
+                'geometry': point,
+                'properties': {
+                    'kind': 'site',
+                    'id': site_id,
+                    'name': site['name'],
+                    'devices': len(site_devices)
+                }
+            })
+            
+            for device in site_devices:
+                wireless_config = snapshot.wireless_map.get(device.get('id'), _EMPTY)
+                features.append({
+                    'type': 'Feature',
+                    'geometry': point,
+                    'properties': {
+                        'kind': 'device',
+                        'id': device.get('id'),
+                        'name': device.get('name'),
+                        'model': device.get('model'),
+                        'type': device.get('type'),
+                        'siteId': site_id,
+                        'frequency': wireless_config.get('frequency'),
+                        'channelWidth': wireless_config.get('channelWidth')
+                    }
+                })
+        
+        for conflict in snapshot.conflicts:
+            site1 = snapshot.site_by_id.get(conflict['device1']['site_id'])
+            site2 = snapshot.site_by_id.get(conflict['device2']['site_id'])
+            
+            # Skip if either site doesn't have valid coordinates
+            if not site1 or not site2:
+                continue
+            
+            features.append({
+                'type': 'Feature',
+                'geometry': {
+                    'type': 'LineString',
+                    'coordinates': [
+                        [site1['longitude'], site1['latitude']],
+                        [site2['longitude'], site2['latitude']]
+                    ]
+                },
+                'properties': {
+                    'kind': 'conflict',
+                    'device1': conflict['device1']['name'],
+                    'device2': conflict['device2']['name'],
+                    'frequency': conflict['frequency'],
+                    'overlap': conflict['overlap']
+                }
+            })
+        
+        geojson = orjson.dumps({'type': 'FeatureCollection', 'features': features})
+        
+        # Save to file if specified
+        if output_file:
+            with open(output_file, 'wb') as f:
+                f.write(geojson)
+            logger.info(f"GeoJSON saved to {output_file}")
+        
+        return geojson
 
 class GeoDashboard:
     """Interactive dashboard for geographical positioning visualization"""
@@ -666,18 +915,79 @@ class GeoDashboard:
         Args:
             database: Initialized frequency database
         """
+        # Dash and its extensions are only needed for the interactive
+        # dashboard, so they are imported here rather than at module load
+        import dash
+        import dash_bootstrap_components as dbc
+        
         self.database = database
         self.visualizer = GeoPositioningVisualizer(database)
+        # Generated maps live in a private directory, removed again when the
+        # process exits
+        self._cache_dir = tempfile.TemporaryDirectory(prefix='geo_maps_')
+        self.cache_dir = self._cache_dir.name
+        # Data version of each generated map, and a lock per map type so a
+        # map is only generated once when requests race
+        self._map_versions = {}
+        self._map_locks = {map_type: threading.Lock() for map_type in MAP_BUILDERS}
         self.app = dash.Dash(
             __name__,
             external_stylesheets=[dbc.themes.BOOTSTRAP],
             title="NYC Mesh Geographical Positioning"
         )
+        self.server = self.app.server
         self._setup_layout()
         self._setup_callbacks()
+        self._setup_routes()
+    
+    def _get_map_file(self, map_type: str) -> str:
+        """
+        Get the generated HTML file for a map type, rebuilding it only when the data changes
+        
+        Maps are stored gzip-compressed, ready to be served with
+        Content-Encoding: gzip.
+        
+        Args:
+            map_type: Map type (a key of MAP_BUILDERS)
+            
+        Returns:
+            Path of the gzip-compressed map HTML file
+        """
+        version = self.database.get_data_version()
+        map_file = os.path.join(self.cache_dir, f"{map_type}.html.gz")
+        
+        with self._map_locks[map_type]:
+            if self._map_versions.get(map_type) != version:
+                builder, _ = MAP_BUILDERS[map_type]
+                m = getattr(self.visualizer, builder)()
+                partial_file = f"{map_file}.partial"
+                with gzip.open(partial_file, 'wt', encoding='utf8',
+                               compresslevel=MAP_COMPRESSION_LEVEL) as f:
+                    f.writelines(iter_map_html(m))
+                
+                # Only the latest version of each map is kept. Swapping it in
+                # with os.replace() never leaves the path missing, so requests
+                # that already got the path still find a complete file, and
+                # those that already opened it keep reading the old one
+                os.replace(partial_file, map_file)
+                self._map_versions[map_type] = version
+        
+        return map_file
+    
+    def pre_warm(self):
+        """Generate every map type ahead of time so the first view of each is instant"""
+        try:
+            with ThreadPoolExecutor(max_workers=len(MAP_BUILDERS)) as executor:
+                list(executor.map(self._get_map_file, MAP_BUILDERS))
+            logger.info("Generated all dashboard maps")
+        except Exception as e:
+            logger.error(f"Failed to generate dashboard maps: {str(e)}")
     
     def _setup_layout(self):
         """Set up the dashboard layout"""
+        from dash import dcc, html
+        import dash_bootstrap_components as dbc
+        
         self.app.layout = dbc.Container([
             dbc.Row([
                 dbc.Col([
@@ -711,7 +1021,7 @@ class GeoDashboard:
                                 dbc.Col([
                                     html.Label("Actions"),
                                     dbc.Button(
-                                        "Generate Map",
+                                        "Refresh Map",
                                         id="generate-map-button",
                                         color="primary",
                                         className="me-2"
@@ -736,7 +1046,9 @@ class GeoDashboard:
                             html.Iframe(
                                 id="map-iframe",
                                 style={"width": "100%", "height": "600px", "border": "none"}
-                            )
+                            ),
+                            dcc.Store(id="map-version"),
+                            dcc.Download(id="map-download")
                         ])
                     ])
                 ])
@@ -749,7 +1061,7 @@ class GeoDashboard:
                         id="export-filename",
                         placeholder="Enter filename",
                         type="text",
-                        value="nyc_mesh_map.html"
+                        value=DEFAULT_EXPORT_FILENAME
                     )
                 ]),
                 dbc.ModalFooter([
@@ -776,39 +1088,49 @@ class GeoDashboard:
     
     def _setup_callbacks(self):
         """Set up the dashboard callbacks"""
+        import dash
+        from dash import dcc, Input, Output, State
         
-        @self.app.callback(
+        # Switching map type only changes the iframe URL, so it runs in the
+        # browser; the server builds or reuses the map when the URL is loaded
+        self.app.clientside_callback(
+            f"""
+            function(mapType, version) {{
+                return '{MAP_ROUTE}' + (mapType || 'devices') + '.html?v=' + (version || '');
+            }}
+            """,
             Output("map-iframe", "src"),
-            Input("generate-map-button", "n_clicks"),
-            State("map-type", "value")
+            Input("map-type", "value"),
+            Input("map-version", "data")
         )
-        def generate_map(n_clicks, map_type):
-            """Generate map based on selected type"""
-            if n_clicks is None:
-                # Default map on load
-                map_file = "device_map.html"
-                self.visualizer.create_device_map(output_file=map_file)
-                return map_file
-            
-            if map_type == "devices":
-                map_file = "device_map.html"
-                self.visualizer.create_device_map(output_file=map_file)
-            elif map_type == "sectors":
-                map_file = "sector_map.html"
-                self.visualizer.create_sector_coverage_map(output_file=map_file)
-            elif map_type == "interference":
-                map_file = "interference_map.html"
-                self.visualizer.create_interference_zone_map(output_file=map_file)
-            elif map_type == "heatmap":
-                map_file = "heatmap.html"
-                self.visualizer.create_frequency_heatmap(output_file=map_file)
-            else:
-                map_file = "device_map.html"
-                self.visualizer.create_device_map(output_file=map_file)
-            
-            return map_file
         
         @self.app.callback(
+            Output("map-version", "data"),
+            Input("generate-map-button", "n_clicks")
+        )
+        def refresh_map(n_clicks):
+            """Reload the map iframe, regenerating the map if the data changed"""
+            return self.database.get_data_version()
+        
+        # Opening and closing the export modal is pure UI state, so it is
+        # toggled in the browser without a round-trip to the server
+        self.app.clientside_callback(
+            """
+            function(nExport, nCancel, nConfirm, isOpen) {
+                var triggered = dash_clientside.callback_context.triggered;
+                if (!triggered || !triggered.length) {
+                    return isOpen;
+                }
+                
+                var buttonId = triggered[0].prop_id.split('.')[0];
+                if (buttonId === 'export-map-button') {
+                    return true;
+                } else if (buttonId === 'export-cancel' || buttonId === 'export-confirm') {
+                    return false;
+                }
+                return isOpen;
+            }
+            """,
             Output("export-modal", "is_open"),
             [
                 Input("export-map-button", "n_clicks"),
@@ -817,103 +1139,206 @@ class GeoDashboard:
             ],
             State("export-modal", "is_open")
         )
-        def toggle_export_modal(n_export, n_cancel, n_confirm, is_open):
-            """Toggle the export modal"""
-            ctx = dash.callback_context
-            if not ctx.triggered:
-                return is_open
-            
-            button_id = ctx.triggered[0]["prop_id"].split(".")[0]
-            if button_id == "export-map-button":
-                return True
-            elif button_id in ["export-cancel", "export-confirm"]:
-                return False
-            return is_open
         
+        # Exports run on the threaded server without holding up other
+        # callbacks; the export buttons are disabled until the file is sent
         @self.app.callback(
-            Output("map-iframe", "src", allow_duplicate=True),
+            Output("map-download", "data"),
             Input("export-confirm", "n_clicks"),
             [
                 State("map-type", "value"),
                 State("export-filename", "value")
             ],
+            running=[
+                (Output("export-map-button", "disabled"), True, False),
+                (Output("export-confirm", "disabled"), True, False)
+            ],
             prevent_initial_call=True
         )
         def export_map(n_clicks, map_type, filename):
-            """Export the current map"""
-            if n_clicks is None:
+            """Send the current map to the browser as a download"""
+            if n_clicks is None or map_type not in MAP_BUILDERS:
                 return dash.no_update
             
-            if not filename:
-                filename = "nyc_mesh_map.html"
+            # Keep only a plain file name with an .html extension
+            filename = UNSAFE_FILENAME_CHARS.sub(
+                '_', os.path.basename(filename or '')
+            ).lstrip('.') or DEFAULT_EXPORT_FILENAME
+            if not filename.lower().endswith('.html'):
+                filename += '.html'
             
-            if map_type == "devices":
-                self.visualizer.create_device_map(output_file=filename)
-            elif map_type == "sectors":
-                self.visualizer.create_sector_coverage_map(output_file=filename)
-            elif map_type == "interference":
-                self.visualizer.create_interference_zone_map(output_file=filename)
-            elif map_type == "heatmap":
-                self.visualizer.create_frequency_heatmap(output_file=filename)
+            with gzip.open(self._get_map_file(map_type), 'rb') as f:
+                return dcc.send_bytes(f.read(), filename, type='text/html')
+    
+    def _setup_routes(self):
+        """Serve the generated maps to the map iframe"""
+        import flask
+        
+        @self.app.server.route(f"{MAP_ROUTE}<map_type>.html")
+        def serve_map(map_type):
+            """Serve the current map of the requested type"""
+            if map_type not in MAP_BUILDERS:
+                flask.abort(404)
             
-            # Return the current map (no change to display)
-            return dash.no_update
+            map_file = self._get_map_file(map_type)
+            if 'gzip' in flask.request.accept_encodings:
+                response = flask.send_file(map_file, mimetype='text/html')
+                response.headers['Content-Encoding'] = 'gzip'
+            else:
+                with gzip.open(map_file, 'rb') as f:
+                    response = flask.Response(f.read(), mimetype='text/html')
+            response.vary.add('Accept-Encoding')
+            return response
+        
+        @self.app.server.route(f"{MAP_ROUTE}network.geojson")
+        def serve_geojson():
+            """Serve the network as GeoJSON for browser-side map clients"""
+            return flask.Response(
+                self.visualizer.export_geojson(),
+                mimetype='application/geo+json'
+            )
     
     def run_server(self, debug=False, port=8050):
-        """Run the dashboard server"""
-        self.app.run_server(debug=debug, port=port)
+        """
+        Run the dashboard server
+        
+        Outside debug mode the dashboard is served by gunicorn (see
+        run_gunicorn()), whose workers build their own dashboards, so this
+        one only serves requests on the development server.
+        
+        Args:
+            debug: Run Dash's development server with its debugging tools
+            port: Port to listen on
+        """
+        if not debug and run_gunicorn(self.database.db_path, port):
+            return
+        
+        self.run_development_server(debug=debug, port=port)
+    
+    def run_development_server(self, debug=False, port=8050):
+        """
+        Run the dashboard on Dash's single-process development server
+        
+        Args:
+            debug: Enable Dash's debugging tools
+            port: Port to listen on
+        """
+        # The only process serving this dashboard, so its maps are
+        # generated up front; gunicorn workers generate theirs on demand
+        threading.Thread(target=self.pre_warm, daemon=True).start()
+        self.app.run(debug=debug, port=port)
+
+
+def create_app(db_path: str = 'frequency_data.db'):
+    """
+    Build the geographical dashboard as a WSGI application
+    
+    Each call opens its own database connection and map cache, so every
+    worker process of a WSGI server builds its own dashboard after it is
+    started instead of sharing one through fork(), e.g.
+    gunicorn 'geographical_positioning:create_app("frequency_data.db")'
+    
+    Maps are generated when they are first requested, rather than every
+    worker generating all of them at startup.
+    
+    Args:
+        db_path: Path to SQLite database file
+        
+    Returns:
+        Flask server of the dashboard
+    """
+    return GeoDashboard(FrequencyDatabase(db_path)).app.server
+
+
+def run_gunicorn(db_path: str, port: int = 8050) -> bool:
+    """
+    Serve the geographical dashboard with gunicorn
+    
+    gunicorn runs one worker process per CPU with SERVER_THREADS threads
+    each, and every worker builds its own dashboard through create_app().
+    
+    Args:
+        db_path: Path to SQLite database file
+        port: Port to listen on
+        
+    Returns:
+        False if gunicorn is not installed, otherwise True once it exits
+    """
+    try:
+        from gunicorn.app.base import BaseApplication
+    except ImportError:
+        logger.warning("gunicorn is not installed, using the development server")
+        return False
+    
+    # Set up the schema once, before the workers open the database together
+    FrequencyDatabase(db_path).close()
+    
+    options = {
+        'bind': f"127.0.0.1:{port}",
+        'workers': os.cpu_count() or 1,
+        'worker_class': 'gthread',
+        'threads': SERVER_THREADS
+    }
+    
+    class DashboardApplication(BaseApplication):
+        """gunicorn application that builds the dashboard in each worker"""
+        
+        def load_config(self):
+            for key, value in options.items():
+                self.cfg.set(key, value)
+        
+        def load(self):
+            return create_app(db_path)
+    
+    DashboardApplication().run()
+    return True
 
 
 def main():
     """Main function"""
     import argparse
     
+    def database_path(path):
+        """Accept only the path of an existing database file"""
+        if not os.path.exists(path):
+            raise argparse.ArgumentTypeError(f"Database file not found: {path}")
+        return path
+    
     parser = argparse.ArgumentParser(description='NYC Mesh Geographical Positioning')
-    parser.add_argument('--db', default='frequency_data.db', help='Database file path')
+    # argparse also applies the type to the default, so it is checked too
+    parser.add_argument('--db', type=database_path, default='frequency_data.db',
+                        help='Database file path')
     parser.add_argument('--output', help='Output directory for maps')
-    parser.add_argument('--type', choices=['devices', 'sectors', 'interference', 'heatmap'], 
-                        default='devices', help='Map type')
+    parser.add_argument('--type', choices=list(MAP_BUILDERS), default='devices', help='Map type')
     parser.add_argument('--dashboard', action='store_true', help='Run interactive dashboard')
     parser.add_argument('--port', type=int, default=8050, help='Dashboard port')
+    parser.add_argument('--debug', action='store_true',
+                        help='Run the dashboard on the development server instead of gunicorn')
     
     args = parser.parse_args()
     
-    # Check if database exists
-    if not os.path.exists(args.db):
-        print(f"Error: Database file not found: {args.db}")
-        sys.exit(1)
-    
-    # Initialize database
-    database = FrequencyDatabase(args.db)
-    
     if args.dashboard:
-        # Run interactive dashboard
-        dashboard = GeoDashboard(database)
-        print(f"Starting dashboard on http://localhost:{args.port}")
-        dashboard.run_server(debug=True, port=args.port)
+        # Run interactive dashboard. gunicorn's workers build their own
+        # dashboards, so one is only built here for the development server
+        logger.info(f"Starting dashboard on http://localhost:{args.port}")
+        if args.debug or not run_gunicorn(args.db, args.port):
+            dashboard = GeoDashboard(FrequencyDatabase(args.db))
+            dashboard.run_development_server(debug=args.debug, port=args.port)
     else:
+        # Initialize database
+        database = FrequencyDatabase(args.db)
+        
         # Create output directory if it doesn't exist
-        if args.output and not os.path.exists(args.output):
-            os.makedirs(args.output)
+        if args.output:
+            os.makedirs(args.output, exist_ok=True)
         
         # Create static map
         visualizer = GeoPositioningVisualizer(database)
         
-        if args.type == 'devices':
-            output_file = os.path.join(args.output, 'device_map.html') if args.output else None
-            visualizer.create_device_map(output_file=output_file)
-        elif args.type == 'sectors':
-            output_file = os.path.join(args.output, 'sector_map.html') if args.output else None
-            visualizer.create_sector_coverage_map(output_file=output_file)
-        elif args.type == 'interference':
-            output_file = os.path.join(args.output, 'interference_map.html') if args.output else None
-            visualizer.create_interference_zone_map(output_file=output_file)
-        elif args.type == 'heatmap':
-            output_file = os.path.join(args.output, 'heatmap.html') if args.output else None
-            visualizer.create_frequency_heatmap(output_file=output_file)
-        
-        if args.output:
-            print(f"Map saved to {output_file}")
+        builder, filename = MAP_BUILDERS[args.type]
+        output_file = os.path.join(args.output, filename) if args.output else None
+        # The map builders log where the map was saved
+        getattr(visualizer, builder)(output_file=output_file)
 
 if __name__ == "__main__":
     main()
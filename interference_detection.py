@@ -6,18 +6,20 @@ This module provides advanced algorithms for detecting and analyzing frequency i
 
 import os
 import sys
-import json
 import logging
 import pandas as pd
 import numpy as np
-from typing import Dict, List, Any, Optional, Union
+from typing import Dict, List, Any, Iterator, Optional, Union
 import math
-import geopy.distance
+from collections import Counter
+from collections.abc import Sequence
 from dataclasses import dataclass
 from sklearn.cluster import DBSCAN
 from scipy.spatial.distance import pdist, squareform
 
 from frequency_database import FrequencyDatabase
+from geo_utils import distance_and_bearing
+from json_stream import REPORT_BUFFER_SIZE, JsonStreamWriter, encode_key
 
 # Configure logging
 logging.basicConfig(
@@ -26,6 +28,37 @@ logging.basicConfig(
 )
 logger = logging.getLogger('interference_detection')
 
+# Report keys, encoded once instead of on every report
+_K_SUMMARY = encode_key('summary')
+_K_TOP_ISSUES = encode_key('top_issues')
+_K_CLUSTERS = encode_key('clusters')
+_K_RESULTS = encode_key('results')
+_K_ALL_ISSUES = encode_key('all_issues')
+
+# Antenna directions parsed from device names, as compass bearings in degrees
+DIR_TO_BEARING = {
+    'north': 0.0,
+    'east': 90.0,
+    'south': 180.0,
+    'west': 270.0
+}
+
+# Beam width in degrees assumed for directional devices
+DEFAULT_BEAM_WIDTH = 90
+
+# Scores below this need no action
+LOW_RISK_SCORE = 20
+LOW_RISK_RECOMMENDATION = "Low interference risk. No action needed."
+
+# Candidate frequencies for recommendations: common center frequencies for
+# 5GHz WiFi
+POTENTIAL_FREQUENCIES = (
+    5180, 5200, 5220, 5240, 5260, 5280, 5300, 5320,  # UNII-1 and UNII-2
+    5500, 5520, 5540, 5560, 5580, 5600, 5620, 5640, 5660, 5680, 5700,  # UNII-2e
+    5745, 5765, 5785, 5805, 5825  # UNII-3
+)
+POTENTIAL_FREQUENCIES_SET = frozenset(POTENTIAL_FREQUENCIES)
+
 @dataclass
 class Device:
     """Data class for device information"""
@@ -43,6 +76,8 @@ class Device:
     freq_max: Optional[float] = None
     direction: Optional[str] = None
     beam_width: Optional[float] = None
+    direction_bearing: Optional[float] = None
+    half_beam_width: Optional[float] = None
 
 @dataclass
 class InterferenceResult:
@@ -55,6 +90,255 @@ class InterferenceResult:
     interference_score: float = 0.0
     recommendation: str = ""
 
+class InterferenceResults(Sequence):
+    """
+    Interference results stored as parallel arrays
+    
+    Behaves like a read-only list of InterferenceResult objects, which are
+    only created when accessed. Missing distances and spatial overlaps are
+    stored as NaN and returned as None.
+    """
+    
+    def __init__(
+        self,
+        devices: List[Device],
+        device1_index: np.ndarray,
+        device2_index: np.ndarray,
+        frequency_overlap: np.ndarray,
+        distance: np.ndarray,
+        spatial_overlap: np.ndarray,
+        interference_score: np.ndarray,
+        recommendation: np.ndarray
+    ):
+        """
+        Initialize the results
+        
+        Args:
+            devices: Devices referenced by the index arrays
+            device1_index: Index of the first device of each result
+            device2_index: Index of the second device of each result
+            frequency_overlap: Frequency overlap in MHz
+            distance: Distance between devices in meters
+            spatial_overlap: Spatial overlap between devices (0-1)
+            interference_score: Interference score
+            recommendation: Recommendation strings (object array)
+        """
+        self.devices = devices
+        self.device1_index = device1_index.astype(np.int32)
+        self.device2_index = device2_index.astype(np.int32)
+        self.frequency_overlap = frequency_overlap
+        self.distance = distance
+        self.spatial_overlap = spatial_overlap
+        self.interference_score = interference_score
+        self.recommendation = recommendation
+    
+    def __len__(self) -> int:
+        return len(self.interference_score)
+    
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self._result(k) for k in range(*index.indices(len(self)))]
+        
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError('interference result index out of range')
+        return self._result(index)
+    
+    def __iter__(self) -> Iterator[InterferenceResult]:
+        for row in zip(
+            self.device1_index.tolist(), self.device2_index.tolist(),
+            self.frequency_overlap.tolist(), self.distance.tolist(),
+            self.spatial_overlap.tolist(), self.interference_score.tolist(),
+            self.recommendation.tolist()
+        ):
+            yield self._make_result(*row)
+    
+    def _result(self, k: int) -> InterferenceResult:
+        """Create the InterferenceResult for row k"""
+        return self._make_result(
+            int(self.device1_index[k]), int(self.device2_index[k]),
+            float(self.frequency_overlap[k]), float(self.distance[k]),
+            float(self.spatial_overlap[k]), float(self.interference_score[k]),
+            self.recommendation[k]
+        )
+    
+    def _make_result(
+        self, i, j, frequency_overlap, distance, spatial_overlap, interference_score, recommendation
+    ) -> InterferenceResult:
+        """Create an InterferenceResult from one row of column values"""
+        return InterferenceResult(
+            device1=self.devices[i],
+            device2=self.devices[j],
+            frequency_overlap=frequency_overlap,
+            distance=None if math.isnan(distance) else distance,
+            spatial_overlap=None if math.isnan(spatial_overlap) else spatial_overlap,
+            interference_score=interference_score,
+            recommendation=recommendation
+        )
+
+
+def _float_array(values) -> np.ndarray:
+    """
+    Convert optional numbers to a float array, with None as NaN
+    
+    Args:
+        values: Iterable of numbers or None
+        
+    Returns:
+        NumPy float64 array
+    """
+    return np.array([np.nan if v is None else v for v in values], dtype=np.float64)
+
+
+def _overlapping_pairs(freq_min: np.ndarray, freq_max: np.ndarray):
+    """
+    Find all pairs of frequency ranges that overlap (touching counts)
+    
+    Ranges are swept in order of their lower edge, so each range is only
+    compared with the ranges that start inside it instead of with every other
+    range.
+    
+    Args:
+        freq_min: Lower edges of the ranges
+        freq_max: Upper edges of the ranges
+        
+    Returns:
+        Tuple of index arrays (i, j) with i < j, ordered by i and then j
+    """
+    order = np.argsort(freq_min, kind='stable')
+    sorted_min = freq_min[order]
+    
+    # Ranges after position p that start at or below its upper edge
+    end = np.searchsorted(sorted_min, freq_max[order], side='right')
+    positions = np.arange(len(order))
+    counts = np.maximum(end - positions - 1, 0)
+    
+    first = np.repeat(positions, counts)
+    starts = np.cumsum(counts) - counts
+    second = np.arange(counts.sum()) - np.repeat(starts, counts) + first + 1
+    
+    first = order[first]
+    second = order[second]
+    pair_i = np.minimum(first, second)
+    pair_j = np.maximum(first, second)
+    
+    # Keep the exact overlap test for ranges with unusual (negative) widths
+    overlapping = (freq_min[pair_i] <= freq_max[pair_j]) & (freq_max[pair_i] >= freq_min[pair_j])
+    pair_i = pair_i[overlapping]
+    pair_j = pair_j[overlapping]
+    
+    pair_order = np.lexsort((pair_j, pair_i))
+    return pair_i[pair_order], pair_j[pair_order]
+
+
+def calculate_spatial_overlaps(
+    bearing: np.ndarray,
+    direction1: np.ndarray,
+    direction2: np.ndarray,
+    half_beam1: np.ndarray,
+    half_beam2: np.ndarray
+) -> np.ndarray:
+    """
+    Calculate spatial overlap for many device pairs based on direction and beam width
+    
+    Missing directions or beam widths are passed as NaN and give a NaN overlap.
+    
+    Args:
+        bearing: Bearing from the first to the second device in degrees
+        direction1: Antenna bearing of the first devices in degrees
+        direction2: Antenna bearing of the second devices in degrees
+        half_beam1: Half the beam width of the first devices in degrees
+        half_beam2: Half the beam width of the second devices in degrees
+        
+    Returns:
+        Array of spatial overlaps between 0 and 1
+    """
+    # Angular difference between each device's direction and the bearing
+    # to the other device
+    angle_diff1 = np.abs((direction1 - bearing + 180) % 360 - 180)
+    angle_diff2 = np.abs((direction2 - (bearing + 180) % 360 + 180) % 360 - 180)
+    
+    # Check whether each device is facing the other
+    facing1 = angle_diff1 <= half_beam1
+    facing2 = angle_diff2 <= half_beam2
+    
+    with np.errstate(divide='ignore', invalid='ignore'):
+        overlap1 = 1 - (angle_diff1 / half_beam1)
+        overlap2 = 1 - (angle_diff2 / half_beam2)
+    
+    # Both facing each other -> mean overlap, only one facing -> half of its
+    # overlap, neither facing -> 0
+    spatial_overlap = np.where(
+        facing1 & facing2,
+        (overlap1 + overlap2) / 2,
+        np.where(facing1, 0.5 * overlap1, np.where(facing2, 0.5 * overlap2, 0.0))
+    )
+    
+    missing = (
+        np.isnan(bearing) | np.isnan(direction1) | np.isnan(direction2) |
+        np.isnan(half_beam1) | np.isnan(half_beam2)
+    )
+    return np.where(missing, np.nan, spatial_overlap)
+
+
+def calculate_interference_scores(
+    frequency_overlap: np.ndarray,
+    distance: np.ndarray,
+    spatial_overlap: np.ndarray,
+    tx_power1: np.ndarray,
+    tx_power2: np.ndarray,
+    channel_width1: np.ndarray,
+    channel_width2: np.ndarray
+) -> np.ndarray:
+    """
+    Calculate interference scores for many device pairs at once
+    
+    Missing distances, spatial overlaps, transmit powers and channel widths
+    are passed as NaN.
+    
+    Args:
+        frequency_overlap: Frequency overlap in MHz
+        distance: Distance between devices in meters
+        spatial_overlap: Spatial overlap between devices (0-1)
+        tx_power1: Transmit power of the first devices in dBm
+        tx_power2: Transmit power of the second devices in dBm
+        channel_width1: Channel width of the first devices in MHz
+        channel_width2: Channel width of the second devices in MHz
+        
+    Returns:
+        Array of interference scores (higher means more severe)
+    """
+    # Base score from frequency overlap
+    # Normalize by the smaller channel width to get a percentage
+    # (missing or zero widths count as 20 MHz)
+    channel_width1 = np.where(np.isnan(channel_width1) | (channel_width1 == 0), 20, channel_width1)
+    channel_width2 = np.where(np.isnan(channel_width2) | (channel_width2 == 0), 20, channel_width2)
+    freq_score = (frequency_overlap / np.minimum(channel_width1, channel_width2)) * 100
+    
+    # Distance factor: inverse relationship with distance, since closer
+    # devices have higher interference potential
+    # Use a sigmoid function to scale between 0.1 and 1.0
+    # 5000m or more -> 0.1, 1000m -> ~0.5, 100m or less -> 1.0
+    # (co-located devices at 0m get the 1.0 limit)
+    with np.errstate(divide='ignore', over='ignore'):
+        distance_factor = 0.1 + (0.9 / (1 + np.exp((np.log10(distance) - 3) * 2)))
+    distance_factor = np.where(np.isnan(distance), 1.0, distance_factor)
+    
+    # Spatial overlap factor: higher overlap means higher interference potential
+    spatial_factor = np.where(np.isnan(spatial_overlap), 1.0, 0.2 + (0.8 * spatial_overlap))
+    
+    # Transmit power factor: higher power means higher interference potential
+    # Normalize to a range of 0.5 to 1.5, assuming max power is ~20 dBm
+    tx_power_factor = np.where(
+        np.isnan(tx_power1) | np.isnan(tx_power2),
+        1.0,
+        0.5 + (((tx_power1 + tx_power2) / 2) / 20)
+    )
+    
+    return freq_score * distance_factor * spatial_factor * tx_power_factor
+
+
 class InterferenceDetector:
     """Detects and analyzes frequency interference between devices"""
     
@@ -68,6 +352,7 @@ class InterferenceDetector:
         self.database = database
         self.devices = []
         self.interference_results = []
+        self._available_frequencies = []
         self.load_devices()
     
     def load_devices(self):
@@ -77,19 +362,11 @@ class InterferenceDetector:
         sites = self.database.get_sites()
         wireless_configs = self.database.get_wireless_configs()
         
-        # Create site lookup
-        site_map = {}
-        for site in sites:
-            site_id = site.get('id')
-            if site_id:
-                site_map[site_id] = site
-        
-        # Create wireless config lookup
-        wireless_map = {}
-        for config in wireless_configs:
-            device_id = config.get('deviceId')
-            if device_id:
-                wireless_map[device_id] = config
+        # Create site and wireless config lookups
+        site_map = {site['id']: site for site in sites if site.get('id')}
+        wireless_map = {
+            config['deviceId']: config for config in wireless_configs if config.get('deviceId')
+        }
         
         # Process devices
         for db_device in db_devices:
@@ -116,23 +393,11 @@ class InterferenceDetector:
                 freq_min = frequency - (channel_width / 2)
                 freq_max = frequency + (channel_width / 2)
             
-            # Determine direction from device name
-            direction = None
-            beam_width = None
+            # Determine direction from device name (first of north, east,
+            # south, west found in the name)
             name_lower = db_device.get('name', '').lower()
-            
-            if 'north' in name_lower:
-                direction = 'north'
-                beam_width = 90  # degrees
-            elif 'east' in name_lower:
-                direction = 'east'
-                beam_width = 90
-            elif 'south' in name_lower:
-                direction = 'south'
-                beam_width = 90
-            elif 'west' in name_lower:
-                direction = 'west'
-                beam_width = 90
+            direction = next((d for d in DIR_TO_BEARING if d in name_lower), None)
+            beam_width = DEFAULT_BEAM_WIDTH if direction is not None else None
             
             # Create device object
             device = Device(
@@ -149,13 +414,38 @@ class InterferenceDetector:
                 freq_min=freq_min,
                 freq_max=freq_max,
                 direction=direction,
-                beam_width=beam_width
+                beam_width=beam_width,
+                direction_bearing=DIR_TO_BEARING.get(direction),
+                half_beam_width=beam_width / 2 if beam_width else None
             )
             
             self.devices.append(device)
         
+        self._build_device_arrays()
+        
         logger.info(f"Loaded {len(self.devices)} devices from database")
     
+    def _build_device_arrays(self):
+        """Store device attributes as parallel NumPy arrays for vectorized detection"""
+        devices = self.devices
+        
+        # Missing values become NaN
+        self._frequency = _float_array(d.frequency for d in devices)
+        self._channel_width = _float_array(d.channel_width for d in devices)
+        self._freq_min = _float_array(d.freq_min for d in devices)
+        self._freq_max = _float_array(d.freq_max for d in devices)
+        self._tx_power = _float_array(d.tx_power for d in devices)
+        self._lat = _float_array(d.latitude for d in devices)
+        self._lon = _float_array(d.longitude for d in devices)
+        self._direction_bearing = _float_array(d.direction_bearing for d in devices)
+        self._half_beam_width = _float_array(d.half_beam_width for d in devices)
+        
+        # Sites as integer codes, so same-site checks compare integers; devices
+        # without a site all share code -1, as None == None
+        self._site_code = pd.factorize(
+            np.array([d.site_id for d in devices], dtype=object)
+        )[0].astype(np.int32)
+    
     def detect_frequency_interference(self):
         """
         Detect frequency interference between devices
@@ -166,144 +456,91 @@ class InterferenceDetector:
         self.interference_results = []
         
         # Filter devices with frequency information
-        freq_devices = [d for d in self.devices if d.frequency is not None and d.channel_width is not None]
+        freq_index = np.flatnonzero(~np.isnan(self._frequency) & ~np.isnan(self._channel_width))
+        freq_devices = [self.devices[k] for k in freq_index.tolist()]
         
         if len(freq_devices) < 2:
             logger.warning("Not enough devices with frequency information for interference detection")
             return self.interference_results
         
-        # Check each pair of devices for frequency overlap
-        for i in range(len(freq_devices)):
-            for j in range(i+1, len(freq_devices)):
-                device1 = freq_devices[i]
-                device2 = freq_devices[j]
-                
-                # Skip if devices are on the same site (co-located)
-                if device1.site_id == device2.site_id:
-                    continue
-                
-                # Calculate frequency overlap
-                if device1.freq_min is None or device1.freq_max is None or \
-                   device2.freq_min is None or device2.freq_max is None:
-                    continue
-                
-                # Check if frequency ranges overlap
-                if device1.freq_min <= device2.freq_max and device1.freq_max >= device2.freq_min:
-                    # Calculate overlap amount
-                    overlap = min(device1.freq_max, device2.freq_max) - max(device1.freq_min, device2.freq_min)
-                    
-                    # Calculate distance if coordinates are available
-                    distance = None
-                    if (device1.latitude is not None and device1.longitude is not None and
-                        device2.latitude is not None and device2.longitude is not None):
-                        try:
-                            distance = geopy.distance.distance(
-                                (device1.latitude, device1.longitude),
-                                (device2.latitude, device2.longitude)
-                            ).meters
-                        except Exception as e:
-                            logger.warning(f"Error calculating distance: {str(e)}")
-                    
-                    # Calculate spatial overlap based on direction and beam width
-                    spatial_overlap = self._calculate_spatial_overlap(device1, device2)
-                    
-                    # Calculate interference score
-                    interference_score = self._calculate_interference_score(
-                        overlap, distance, spatial_overlap, device1, device2
-                    )
-                    
-                    # Generate recommendation
-                    recommendation = self._generate_recommendation(
-                        device1, device2, overlap, distance, interference_score
-                    )
-                    
-                    # Create interference result
-                    result = InterferenceResult(
-                        device1=device1,
-                        device2=device2,
-                        frequency_overlap=overlap,
-                        distance=distance,
-                        spatial_overlap=spatial_overlap,
-                        interference_score=interference_score,
-                        recommendation=recommendation
-                    )
-                    
-                    self.interference_results.append(result)
-        
-        # Sort results by interference score (descending)
-        self.interference_results.sort(key=lambda x: x.interference_score, reverse=True)
+        # Attributes of the devices with frequency information, so all pairs
+        # can be tested at once
+        freq_min = self._freq_min[freq_index]
+        freq_max = self._freq_max[freq_index]
+        site_codes = self._site_code[freq_index]
+        lat = self._lat[freq_index]
+        lon = self._lon[freq_index]
+        tx_power = self._tx_power[freq_index]
+        channel_width = self._channel_width[freq_index]
+        direction_bearing = self._direction_bearing[freq_index]
+        half_beam_width = self._half_beam_width[freq_index]
+        
+        # Pairs (i < j) of devices on different sites whose frequency ranges
+        # overlap, in the same order as a nested loop over i and j
+        pair_i, pair_j = _overlapping_pairs(freq_min, freq_max)
+        different_sites = site_codes[pair_i] != site_codes[pair_j]
+        pair_i = pair_i[different_sites]
+        pair_j = pair_j[different_sites]
+        
+        # Calculate overlap amounts
+        overlaps = (
+            np.minimum(freq_max[pair_i], freq_max[pair_j]) -
+            np.maximum(freq_min[pair_i], freq_min[pair_j])
+        )
+        
+        # Distances and bearings; NaN where coordinates are missing
+        distances, bearings = distance_and_bearing(
+            lat[pair_i], lon[pair_i], lat[pair_j], lon[pair_j]
+        )
+        
+        # Calculate spatial overlap based on direction and beam width
+        spatial_overlaps = calculate_spatial_overlaps(
+            bearings,
+            direction_bearing[pair_i],
+            direction_bearing[pair_j],
+            half_beam_width[pair_i],
+            half_beam_width[pair_j]
+        )
+        
+        # Frequencies in use don't change between pairs, so find the unused
+        # candidates for recommendations once
+        used_frequencies = {d.frequency for d in self.devices if d.frequency is not None}
+        self._available_frequencies = [f for f in POTENTIAL_FREQUENCIES if f not in used_frequencies]
+        
+        # Calculate interference scores for all pairs in one pass
+        scores = calculate_interference_scores(
+            overlaps,
+            distances,
+            spatial_overlaps,
+            tx_power[pair_i],
+            tx_power[pair_j],
+            channel_width[pair_i],
+            channel_width[pair_j]
+        )
+        
+        # Generate recommendations; low-risk pairs all share the same one
+        recommendations = np.full(len(scores), LOW_RISK_RECOMMENDATION, dtype=object)
+        at_risk = np.flatnonzero(scores >= LOW_RISK_SCORE)
+        recommendations[at_risk] = self._generate_recommendations(
+            freq_devices, pair_i[at_risk], pair_j[at_risk], scores[at_risk]
+        )
+        
+        # Sort results by interference score (descending, ties kept in pair order)
+        order = np.argsort(-scores, kind='stable')
+        self.interference_results = InterferenceResults(
+            freq_devices,
+            pair_i[order],
+            pair_j[order],
+            overlaps[order],
+            distances[order],
+            spatial_overlaps[order],
+            scores[order],
+            recommendations[order]
+        )
         
         logger.info(f"Detected {len(self.interference_results)} potential interference issues")
         return self.interference_results
     
-    def _calculate_spatial_overlap(self, device1: Device, device2: Device) -> Optional[float]:
-        """
-        Calculate spatial overlap between two devices based on direction and beam width
-        
-        Args:
-            device1: First device
-            device2: Second device
-            
-        Returns:
-            Spatial overlap as a value between 0 and 1, or None if not applicable
-        """
-        # Skip if missing coordinates or direction information
-        if (device1.latitude is None or device1.longitude is None or
-            device2.latitude is None or device2.longitude is None or
-            device1.direction is None or device2.direction is None or
-            device1.beam_width is None or device2.beam_width is None):
-            return None
-        
-        try:
-            # Calculate bearing between devices
-            bearing1to2 = geopy.distance.geodesic(
-                (device1.latitude, device1.longitude),
-                (device2.latitude, device2.longitude)
-            ).bearing
-            
-            bearing2to1 = (bearing1to2 + 180) % 360
-            
-            # Convert direction to bearing
-            dir_to_bearing = {
-                'north': 0,
-                'east': 90,
-                'south': 180,
-                'west': 270
-            }
-            
-            bearing1 = dir_to_bearing.get(device1.direction)
-            bearing2 = dir_to_bearing.get(device2.direction)
-            
-            if bearing1 is None or bearing2 is None:
-                return None
-            
-            # Calculate angular difference between device direction and bearing to other device
-            angle_diff1 = abs((bearing1 - bearing1to2 + 180) % 360 - 180)
-            angle_diff2 = abs((bearing2 - bearing2to1 + 180) % 360 - 180)
-            
-            # Check if devices are facing each other
-            half_beam1 = device1.beam_width / 2
-            half_beam2 = device2.beam_width / 2
-            
-            # Calculate overlap percentage
-            if angle_diff1 <= half_beam1 and angle_diff2 <= half_beam2:
-                # Both devices are facing each other
-                overlap1 = 1 - (angle_diff1 / half_beam1)
-                overlap2 = 1 - (angle_diff2 / half_beam2)
-                return (overlap1 + overlap2) / 2
-            elif angle_diff1 <= half_beam1:
-                # Only device1 is facing device2
-                return 0.5 * (1 - (angle_diff1 / half_beam1))
-            elif angle_diff2 <= half_beam2:
-                # Only device2 is facing device1
-                return 0.5 * (1 - (angle_diff2 / half_beam2))
-            else:
-                # Neither device is facing the other
-                return 0.0
-        except Exception as e:
-            logger.warning(f"Error calculating spatial overlap: {str(e)}")
-            return None
-    
     def _calculate_interference_score(
         self, 
         frequency_overlap: float, 
@@ -325,133 +562,89 @@ class InterferenceDetector:
         Returns:
             Interference score (higher means more severe)
         """
-        # Base score from frequency overlap
-        # Normalize by the smaller channel width to get a percentage
-        min_channel_width = min(device1.channel_width or 20, device2.channel_width or 20)
-        freq_score = (frequency_overlap / min_channel_width) * 100
-        
-        # Distance factor (if available)
-        distance_factor = 1.0
-        if distance is not None:
-            # Inverse relationship with distance
-            # Closer devices have higher interference potential
-            # Use a sigmoid function to scale between 0.1 and 1.0
-            # 5000m or more -> 0.1, 1000m -> ~0.5, 100m or less -> 1.0
-            distance_factor = 0.1 + (0.9 / (1 + math.exp((math.log10(distance) - 3) * 2)))
-        
-        # Spatial overlap factor (if available)
-        spatial_factor = 1.0
-        if spatial_overlap is not None:
-            # Direct relationship with spatial overlap
-            # Higher overlap means higher interference potential
-            spatial_factor = 0.2 + (0.8 * spatial_overlap)
-        
-        # Transmit power factor
-        tx_power_factor = 1.0
-        if device1.tx_power is not None and device2.tx_power is not None:
-            # Higher power means higher interference potential
-            # Normalize to a range of 0.5 to 1.5
-            avg_power = (device1.tx_power + device2.tx_power) / 2
-            tx_power_factor = 0.5 + (avg_power / 20)  # Assuming max power is ~20 dBm
-        
-        # Calculate final score
-        score = freq_score * distance_factor * spatial_factor * tx_power_factor
-        
-        return score
-    
-    def _generate_recommendation(
-        self, 
-        device1: Device, 
-        device2: Device, 
-        overlap: float,
-        distance: Optional[float],
-        score: float
-    ) -> str:
-        """
-        Generate recommendation for resolving interference
-        
-        Args:
-            device1: First device
-            device2: Second device
-            overlap: Frequency overlap in MHz
-            distance: Distance between devices in meters
-            score: Interference score
-            
-        Returns:
-            Recommendation string
-        """
-        if score < 20:
-            return "Low interference risk. No action needed."
-        
-        recommendations = []
-        
-        # Find alternative frequencies
-        alt_freq = self._find_alternative_frequency(device1, device2)
-        if alt_freq:
-            device_to_change = device1 if device1.frequency == alt_freq[0] else device2
-            recommendations.append(
-                f"Change {device_to_change.name} frequency from {device_to_change.frequency} MHz "
-                f"to {alt_freq[1]} MHz."
-            )
-        
-        # Suggest power reduction for high-power devices
-        if device1.tx_power is not None and device1.tx_power > 15:
-            recommendations.append(f"Reduce transmit power of {device1.name} from {device1.tx_power} dBm to {device1.tx_power - 3} dBm.")
-        
-        if device2.tx_power is not None and device2.tx_power > 15:
-            recommendations.append(f"Reduce transmit power of {device2.name} from {device2.tx_power} dBm to {device2.tx_power - 3} dBm.")
-        
-        # Suggest adjusting antenna direction if applicable
-        if device1.direction is not None and device2.direction is not None:
-            recommendations.append(f"Adjust antenna direction of {device1.name} or {device2.name} to reduce overlap.")
-        
-        if not recommendations:
-            recommendations.append("Consider changing frequency of one device to a different band.")
-        
-        severity = "High" if score > 70 else "Medium" if score > 40 else "Low"
-        
-        return f"Interference Severity: {severity}. " + " ".join(recommendations)
+        score = calculate_interference_scores(
+            frequency_overlap,
+            _float_array([distance])[0],
+            _float_array([spatial_overlap])[0],
+            _float_array([device1.tx_power])[0],
+            _float_array([device2.tx_power])[0],
+            _float_array([device1.channel_width])[0],
+            _float_array([device2.channel_width])[0]
+        )
+        
+        return float(score)
     
-    def _find_alternative_frequency(self, device1: Device, device2: Device) -> Optional[tuple]:
+    def _generate_recommendations(
+        self,
+        devices: List[Device],
+        device1_index: np.ndarray,
+        device2_index: np.ndarray,
+        scores: np.ndarray
+    ) -> List[str]:
         """
-        Find alternative frequency for one of the devices
+        Generate recommendations for resolving interference between device pairs
+        
+        Sentences that only depend on one device are built once per device
+        rather than once per pair.
         
         Args:
-            device1: First device
-            device2: Second device
+            devices: Devices referenced by the index arrays
+            device1_index: Index of the first device of each pair
+            device2_index: Index of the second device of each pair
+            scores: Interference score of each pair
             
         Returns:
-            Tuple of (current_frequency, alternative_frequency) or None if not found
+            List of recommendation strings
         """
-        # Get all frequencies in use
-        used_frequencies = set()
-        for device in self.devices:
-            if device.frequency is not None:
-                used_frequencies.add(device.frequency)
-        
-        # Define potential frequencies in 5GHz band
-        # These are common center frequencies for 5GHz WiFi
-        potential_frequencies = [
-            5180, 5200, 5220, 5240, 5260, 5280, 5300, 5320,  # UNII-1 and UNII-2
-            5500, 5520, 5540, 5560, 5580, 5600, 5620, 5640, 5660, 5680, 5700,  # UNII-2e
-            5745, 5765, 5785, 5805, 5825  # UNII-3
+        # Suggest the first unused candidate frequency for devices currently
+        # on one of the candidate frequencies
+        # For simplicity, just pick the first available frequency
+        # In a real implementation, would need to consider more factors
+        alt_freq = self._available_frequencies[0] if self._available_frequencies else None
+        change_frequency = [
+            f"Change {device.name} frequency from {device.frequency} MHz to {alt_freq} MHz."
+            if alt_freq is not None and device.frequency in POTENTIAL_FREQUENCIES_SET else None
+            for device in devices
         ]
         
-        # Find frequencies not in use
-        available_frequencies = [f for f in potential_frequencies if f not in used_frequencies]
-        
-        if not available_frequencies:
-            return None
+        # Suggest power reduction for high-power devices
+        reduce_power = [
+            f"Reduce transmit power of {device.name} from {device.tx_power:g} dBm to {device.tx_power - 3:g} dBm."
+            if device.tx_power is not None and device.tx_power > 15 else None
+            for device in devices
+        ]
         
-        # Find the best alternative frequency
-        # For simplicity, just pick the first available frequency
-        # In a real implementation, would need to consider more factors
-        if device1.frequency in potential_frequencies:
-            return (device1.frequency, available_frequencies[0])
-        elif device2.frequency in potential_frequencies:
-            return (device2.frequency, available_frequencies[0])
+        recommendations = []
+        for i, j, score in zip(device1_index.tolist(), device2_index.tolist(), scores.tolist()):
+            device1 = devices[i]
+            device2 = devices[j]
+            pair_recommendations = []
+            
+            # Change the first device if it is on a candidate frequency,
+            # otherwise the second
+            change = change_frequency[i] or change_frequency[j]
+            if change:
+                pair_recommendations.append(change)
+            
+            if reduce_power[i]:
+                pair_recommendations.append(reduce_power[i])
+            if reduce_power[j]:
+                pair_recommendations.append(reduce_power[j])
+            
+            # Suggest adjusting antenna direction if applicable
+            if device1.direction is not None and device2.direction is not None:
+                pair_recommendations.append(
+                    f"Adjust antenna direction of {device1.name} or {device2.name} to reduce overlap."
+                )
+            
+            if not pair_recommendations:
+                pair_recommendations.append("Consider changing frequency of one device to a different band.")
+            
+            severity = "High" if score > 70 else "Medium" if score > 40 else "Low"
+            
+            recommendations.append(f"Interference Severity: {severity}. " + " ".join(pair_recommendations))
         
-        return None
+        return recommendations
     
     def cluster_interference_issues(self, eps=30, min_samples=2):
         """
@@ -468,24 +661,26 @@ class InterferenceDetector:
             logger.warning("No interference results available for clustering")
             return {}
         
-        # Extract features for clustering
-        features = []
-        for result in self.interference_results:
-            # Use frequency and score as features
-            features.append([
-                result.device1.frequency or 0,
-                result.device2.frequency or 0,
-                result.interference_score
-            ])
-        
-        # Convert to numpy array
-        X = np.array(features)
-        
-        # Normalize features
-        X_norm = (X - X.mean(axis=0)) / X.std(axis=0)
+        # Extract features for clustering straight into one preallocated array
+        # Use frequency and score as features
+        X = np.fromiter(
+            (
+                (result.device1.frequency or 0, result.device2.frequency or 0, result.interference_score)
+                for result in self.interference_results
+            ),
+            dtype=np.dtype((np.float64, 3)),
+            count=len(self.interference_results)
+        )
+        
+        # Normalize features in place; constant features (e.g. every issue on
+        # one frequency) are left at zero instead of becoming NaN
+        std = X.std(axis=0)
+        std[std == 0] = 1
+        X -= X.mean(axis=0)
+        X /= std
         
         # Perform clustering
-        clustering = DBSCAN(eps=eps, min_samples=min_samples).fit(X_norm)
+        clustering = DBSCAN(eps=eps, min_samples=min_samples, n_jobs=-1).fit(X)
         
         # Get cluster labels
         labels = clustering.labels_
@@ -495,7 +690,7 @@ class InterferenceDetector:
         
         # Group results by cluster
         clusters = {}
-        for i, label in enumerate(labels):
+        for i, label in enumerate(labels.tolist()):
             if label == -1:
                 # Skip noise
                 continue
@@ -511,41 +706,19 @@ class InterferenceDetector:
             # Calculate average score
             avg_score = sum(r.interference_score for r in results) / len(results)
             
-            # Find most common devices
-            devices = []
-            for r in results:
-                devices.append(r.device1.name)
-                devices.append(r.device2.name)
-            
-            device_counts = {}
-            for device in devices:
-                if device not in device_counts:
-                    device_counts[device] = 0
-                device_counts[device] += 1
-            
-            # Sort by count (descending)
-            common_devices = sorted(device_counts.items(), key=lambda x: x[1], reverse=True)
-            
-            # Find most common frequencies
-            frequencies = []
-            for r in results:
-                frequencies.append(r.device1.frequency)
-                frequencies.append(r.device2.frequency)
-            
-            freq_counts = {}
-            for freq in frequencies:
-                if freq not in freq_counts:
-                    freq_counts[freq] = 0
-                freq_counts[freq] += 1
-            
-            # Sort by count (descending)
-            common_frequencies = sorted(freq_counts.items(), key=lambda x: x[1], reverse=True)
+            # Find the top 3 most common devices and frequencies
+            common_devices = Counter(
+                name for r in results for name in (r.device1.name, r.device2.name)
+            ).most_common(3)
+            common_frequencies = Counter(
+                freq for r in results for freq in (r.device1.frequency, r.device2.frequency)
+            ).most_common(3)
             
             cluster_stats[label] = {
                 'size': len(results),
                 'avg_score': avg_score,
-                'common_devices': common_devices[:3],  # Top 3
-                'common_frequencies': common_frequencies[:3],  # Top 3
+                'common_devices': common_devices,
+                'common_frequencies': common_frequencies,
                 'results': results
             }
         
@@ -554,6 +727,82 @@ class InterferenceDetector:
             'clusters': cluster_stats
         }
     
+    def _result_scores(self) -> np.ndarray:
+        """
+        Get the interference scores of the current results
+        
+        Returns:
+            Array of scores in result order
+        """
+        results = self.interference_results
+        if isinstance(results, InterferenceResults):
+            return results.interference_score
+        return np.fromiter((r.interference_score for r in results), dtype=np.float64, count=len(results))
+    
+    def _issue_entry(self, result: InterferenceResult) -> Dict:
+        """
+        Build the report entry for one interference result
+        
+        Args:
+            result: Interference result
+            
+        Returns:
+            Issue dictionary
+        """
+        return {
+            'device1': {
+                'id': result.device1.id,
+                'name': result.device1.name,
+                'frequency': result.device1.frequency,
+                'channel_width': result.device1.channel_width
+            },
+            'device2': {
+                'id': result.device2.id,
+                'name': result.device2.name,
+                'frequency': result.device2.frequency,
+                'channel_width': result.device2.channel_width
+            },
+            'frequency_overlap': result.frequency_overlap,
+            'distance': result.distance,
+            'interference_score': result.interference_score,
+            'recommendation': result.recommendation
+        }
+    
+    def _write_report(self, report: Dict, output_file: str):
+        """
+        Stream the interference report to a JSON file
+        
+        Args:
+            report: Report dictionary from generate_interference_report()
+            output_file: Output file path
+        """
+        with open(output_file, 'wb', buffering=REPORT_BUFFER_SIZE) as f:
+            writer = JsonStreamWriter(f)
+            writer.begin_object()
+            writer.write_value(report['summary'], key=_K_SUMMARY)
+            writer.write_value(report['top_issues'], key=_K_TOP_ISSUES)
+            
+            # Cluster results are written as issue entries
+            writer.begin_object(key=_K_CLUSTERS)
+            for label, stats in report['clusters'].items():
+                writer.begin_object(key=label)
+                for name, value in stats.items():
+                    if name != 'results':
+                        writer.write_value(value, key=name)
+                writer.begin_array(key=_K_RESULTS)
+                for result in stats['results']:
+                    writer.write_value(self._issue_entry(result))
+                writer.end_array()
+                writer.end_object()
+            writer.end_object()
+            
+            writer.begin_array(key=_K_ALL_ISSUES)
+            for result in self.interference_results:
+                writer.write_value(self._issue_entry(result))
+            writer.end_array()
+            
+            writer.end_object()
+    
     def generate_interference_report(self, output_file: Optional[str] = None) -> Dict:
         """
         Generate comprehensive interference report
@@ -562,7 +811,8 @@ class InterferenceDetector:
             output_file: Optional file path to save the report
             
         Returns:
-            Report dictionary
+            Report dictionary with the summary, top issues and clusters (the
+            full issue list is only written to the output file)
         """
         # Ensure we have interference results
         if not self.interference_results:
@@ -571,69 +821,31 @@ class InterferenceDetector:
         # Cluster interference issues
         clusters = self.cluster_interference_issues()
         
-        # Prepare report data
+        # Tally severities over the score array
+        scores = self._result_scores()
+        
+        # Prepare report data; all issues are only streamed to the output
+        # file, so the full list is never held in memory
         report = {
             'summary': {
                 'total_devices': len(self.devices),
                 'devices_with_frequency': sum(1 for d in self.devices if d.frequency is not None),
                 'total_interference_issues': len(self.interference_results),
-                'high_severity_issues': sum(1 for r in self.interference_results if r.interference_score > 70),
-                'medium_severity_issues': sum(1 for r in self.interference_results if 40 < r.interference_score <= 70),
-                'low_severity_issues': sum(1 for r in self.interference_results if r.interference_score <= 40),
+                'high_severity_issues': int(np.count_nonzero(scores > 70)),
+                'medium_severity_issues': int(np.count_nonzero((scores > 40) & (scores <= 70))),
+                'low_severity_issues': int(np.count_nonzero(scores <= 40)),
                 'clusters': clusters.get('n_clusters', 0)
             },
-            'top_issues': [],
-            'clusters': clusters.get('clusters', {}),
-            'all_issues': []
+            'top_issues': [
+                {'rank': i + 1, **self._issue_entry(result)}
+                for i, result in enumerate(self.interference_results[:10])
+            ],
+            'clusters': clusters.get('clusters', {})
         }
         
-        # Add top issues (up to 10)
-        for i, result in enumerate(self.interference_results[:10]):
-            report['top_issues'].append({
-                'rank': i + 1,
-                'device1': {
-                    'id': result.device1.id,
-                    'name': result.device1.name,
-                    'frequency': result.device1.frequency,
-                    'channel_width': result.device1.channel_width
-                },
-                'device2': {
-                    'id': result.device2.id,
-                    'name': result.device2.name,
-                    'frequency': result.device2.frequency,
-                    'channel_width': result.device2.channel_width
-                },
-                'frequency_overlap': result.frequency_overlap,
-                'distance': result.distance,
-                'interference_score': result.interference_score,
-                'recommendation': result.recommendation
-            })
-        
-        # Add all issues
-        for result in self.interference_results:
-            report['all_issues'].append({
-                'device1': {
-                    'id': result.device1.id,
-                    'name': result.device1.name,
-                    'frequency': result.device1.frequency,
-                    'channel_width': result.device1.channel_width
-                },
-                'device2': {
-                    'id': result.device2.id,
-                    'name': result.device2.name,
-                    'frequency': result.device2.frequency,
-                    'channel_width': result.device2.channel_width
-                },
-                'frequency_overlap': result.frequency_overlap,
-                'distance': result.distance,
-                'interference_score': result.interference_score,
-                'recommendation': result.recommendation
-            })
-        
         # Save to file if specified
         if output_file:
-            with open(output_file, 'w') as f:
-                json.dump(report, f, indent=2)
+            self._write_report(report, output_file)
             logger.info(f"Interference report saved to {output_file}")
         
         return report
@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+"""
+JSON Streaming Module for NYC Mesh Frequency Management Tool
+This module writes large JSON reports incrementally instead of building them in memory.
+"""
+
+from typing import Any, BinaryIO, Optional
+import orjson
+
+# Write buffer for streamed reports (1 MiB)
+REPORT_BUFFER_SIZE = 1 << 20
+
+
+def encode_key(key: Any) -> bytes:
+    """
+    Pre-encode an object member name
+    
+    Args:
+        key: Member name
+        
+    Returns:
+        JSON-encoded key bytes that can be passed as a key to JsonStreamWriter
+    """
+    return orjson.dumps(str(key))
+
+
+class JsonStreamWriter:
+    """Incrementally writes a JSON document to a binary file"""
+
+    def __init__(self, f: BinaryIO, option: int = orjson.OPT_NON_STR_KEYS):
+        """
+        Initialize the stream writer
+
+        Args:
+            f: File object opened in binary write mode
+            option: orjson options used when serializing individual values
+        """
+        self.f = f
+        self.option = option
+        # One entry per open container: True once it holds at least one member
+        self._has_members = []
+
+    def _begin_member(self, key: Optional[Any]):
+        """Write the separator and, inside objects, the key for the next member"""
+        if self._has_members:
+            if self._has_members[-1]:
+                self.f.write(b',')
+            self._has_members[-1] = True
+            self.f.write(b'\n')
+
+        if key is not None:
+            # Keys pre-encoded with encode_key() are written as-is
+            self.f.write(key if isinstance(key, bytes) else encode_key(key))
+            self.f.write(b': ')
+
+    def begin_object(self, key: Optional[Any] = None):
+        """
+        Open a JSON object
+
+        Args:
+            key: Member name when the object is nested inside another object
+        """
+        self._begin_member(key)
+        self.f.write(b'{')
+        self._has_members.append(False)
+
+    def end_object(self):
+        """Close the innermost JSON object"""
+        self._has_members.pop()
+        self.f.write(b'\n}')
+
+    def begin_array(self, key: Optional[Any] = None):
+        """
+        Open a JSON array
+
+        Args:
+            key: Member name when the array is nested inside an object
+        """
+        self._begin_member(key)
+        self.f.write(b'[')
+        self._has_members.append(False)
+
+    def end_array(self):
+        """Close the innermost JSON array"""
+        self._has_members.pop()
+        self.f.write(b'\n]')
+
+    def write_value(self, value: Any, key: Optional[Any] = None):
+        """
+        Serialize a complete value as the next member
+
+        Args:
+            value: JSON-serializable value
+            key: Member name when writing inside an object
+        """
+        self._begin_member(key)
+        self.f.write(orjson.dumps(value, option=self.option))
@@ -9,10 +9,13 @@ import sys
 import json
 import logging
 import argparse
+import threading
+from collections import defaultdict
 from datetime import datetime
 import dash
 from dash import dcc, html, Input, Output, State
 import dash_bootstrap_components as dbc
+from flask_caching import Cache
 import plotly.graph_objects as go
 import plotly.express as px
 import pandas as pd
@@ -22,7 +25,7 @@ import numpy as np
 from uisp_api_client import UISPAPIClient, FrequencyDataCollector
 from frequency_database import FrequencyDatabase, create_database
 from frequency_data_manager import FrequencyDataManager
-from frequency_visualization import FrequencyVisualizer
+from frequency_visualization import FrequencyVisualizer, FIGURE_CACHE_TIMEOUT
 from geographical_positioning import GeoPositioningVisualizer
 from interference_detection import InterferenceDetector
 
@@ -51,6 +54,12 @@ class NYCMeshFrequencyTool:
         self.geo_visualizer = None
         self.interference_detector = None
         
+        # Data version each generated output file was built from, and a lock
+        # per output file so a file is only built once when requests race
+        self._output_versions = {}
+        self._output_locks = defaultdict(threading.Lock)
+        self._output_locks_lock = threading.Lock()
+        
         # Initialize components
         self._initialize_components()
     
@@ -168,6 +177,29 @@ class NYCMeshFrequencyTool:
             logger.error(f"Error collecting data: {str(e)}")
             return False
     
+    def _write_output(self, output_file, build):
+        """
+        Write a visualization file, skipping the rebuild when it already
+        holds the current data
+        
+        Args:
+            output_file: Output file path
+            build: Visualizer method that writes to its output_file argument
+            
+        Returns:
+            Output file path
+        """
+        # Only the lock lookup is shared, so different files build in parallel
+        with self._output_locks_lock:
+            output_lock = self._output_locks[output_file]
+        
+        with output_lock:
+            version = self.database.get_data_version()
+            if self._output_versions.get(output_file) != version or not os.path.exists(output_file):
+                build(output_file=output_file)
+                self._output_versions[output_file] = version
+        return output_file
+    
     def generate_visualizations(self):
         """
         Generate all visualizations
@@ -180,34 +212,36 @@ class NYCMeshFrequencyTool:
         
         try:
             # Generate frequency visualizations
-            freq_allocation_file = os.path.join(output_dir, 'frequency_allocation.html')
-            self.visualizer.create_frequency_chart(output_file=freq_allocation_file)
-            visualization_files['frequency_allocation'] = freq_allocation_file
-            
-            conflict_matrix_file = os.path.join(output_dir, 'frequency_conflicts.html')
-            self.visualizer.create_conflict_matrix(output_file=conflict_matrix_file)
-            visualization_files['conflict_matrix'] = conflict_matrix_file
-            
-            spectrum_file = os.path.join(output_dir, 'frequency_spectrum.html')
-            self.visualizer.create_frequency_spectrum(output_file=spectrum_file)
-            visualization_files['frequency_spectrum'] = spectrum_file
+            visualization_files['frequency_allocation'] = self._write_output(
+                os.path.join(output_dir, 'frequency_allocation.html'),
+                self.visualizer.create_frequency_chart
+            )
+            visualization_files['conflict_matrix'] = self._write_output(
+                os.path.join(output_dir, 'frequency_conflicts.html'),
+                self.visualizer.create_conflict_matrix
+            )
+            visualization_files['frequency_spectrum'] = self._write_output(
+                os.path.join(output_dir, 'frequency_spectrum.html'),
+                self.visualizer.create_frequency_spectrum
+            )
             
             # Generate geographical visualizations
-            device_map_file = os.path.join(output_dir, 'device_map.html')
-            self.geo_visualizer.create_device_map(output_file=device_map_file)
-            visualization_files['device_map'] = device_map_file
-            
-            sector_map_file = os.path.join(output_dir, 'sector_coverage.html')
-            self.geo_visualizer.create_sector_coverage_map(output_file=sector_map_file)
-            visualization_files['sector_coverage'] = sector_map_file
-            
-            interference_map_file = os.path.join(output_dir, 'interference_zones.html')
-            self.geo_visualizer.create_interference_zone_map(output_file=interference_map_file)
-            visualization_files['interference_zones'] = interference_map_file
-            
-            heatmap_file = os.path.join(output_dir, 'frequency_heatmap.html')
-            self.geo_visualizer.create_frequency_heatmap(output_file=heatmap_file)
-            visualization_files['frequency_heatmap'] = heatmap_file
+            visualization_files['device_map'] = self._write_output(
+                os.path.join(output_dir, 'device_map.html'),
+                self.geo_visualizer.create_device_map
+            )
+            visualization_files['sector_coverage'] = self._write_output(
+                os.path.join(output_dir, 'sector_coverage.html'),
+                self.geo_visualizer.create_sector_coverage_map
+            )
+            visualization_files['interference_zones'] = self._write_output(
+                os.path.join(output_dir, 'interference_zones.html'),
+                self.geo_visualizer.create_interference_zone_map
+            )
+            visualization_files['frequency_heatmap'] = self._write_output(
+                os.path.join(output_dir, 'frequency_heatmap.html'),
+                self.geo_visualizer.create_frequency_heatmap
+            )
             
             logger.info(f"Generated {len(visualization_files)} visualizations")
             return visualization_files
@@ -495,6 +529,20 @@ class NYCMeshFrequencyTool:
         Args:
             app: Dash app
         """
+        cache = Cache(app.server, config={'CACHE_TYPE': 'SimpleCache'})
+        
+        @cache.memoize(timeout=FIGURE_CACHE_TIMEOUT)
+        def build_figure(viz_type, data_version):
+            """Build a frequency visualization, memoized per data version"""
+            if viz_type == "allocation":
+                return self.visualizer.create_frequency_chart()
+            elif viz_type == "conflicts":
+                return self.visualizer.create_conflict_matrix()
+            elif viz_type == "spectrum":
+                return self.visualizer.create_frequency_spectrum()
+            else:
+                return go.Figure()
+        
         @app.callback(
             [
                 Output("data-collection-status", "children"),
@@ -544,14 +592,7 @@ class NYCMeshFrequencyTool:
             if not n_clicks:
                 return go.Figure()
             
-            if viz_type == "allocation":
-                return self.visualizer.create_frequency_chart()
-            elif viz_type == "conflicts":
-                return self.visualizer.create_conflict_matrix()
-            elif viz_type == "spectrum":
-                return self.visualizer.create_frequency_spectrum()
-            else:
-                return go.Figure()
+            return build_figure(viz_type, self.database.get_data_version())
         
         @app.callback(
             Output("map-iframe", "src"),
@@ -570,21 +611,25 @@ class NYCMeshFrequencyTool:
             output_dir = self.config['output']['directory']
             
             if map_type == "devices":
-                map_file = os.path.join(output_dir, 'device_map.html')
-                self.geo_visualizer.create_device_map(output_file=map_file)
-                return map_file
+                return self._write_output(
+                    os.path.join(output_dir, 'device_map.html'),
+                    self.geo_visualizer.create_device_map
+                )
             elif map_type == "sectors":
-                map_file = os.path.join(output_dir, 'sector_coverage.html')
-                self.geo_visualizer.create_sector_coverage_map(output_file=map_file)
-                return map_file
+                return self._write_output(
+                    os.path.join(output_dir, 'sector_coverage.html'),
+                    self.geo_visualizer.create_sector_coverage_map
+                )
             elif map_type == "interference":
-                map_file = os.path.join(output_dir, 'interference_zones.html')
-                self.geo_visualizer.create_interference_zone_map(output_file=map_file)
-                return map_file
+                return self._write_output(
+                    os.path.join(output_dir, 'interference_zones.html'),
+                    self.geo_visualizer.create_interference_zone_map
+                )
             elif map_type == "heatmap":
-                map_file = os.path.join(output_dir, 'frequency_heatmap.html')
-                self.geo_visualizer.create_frequency_heatmap(output_file=map_file)
-                return map_file
+                return self._write_output(
+                    os.path.join(output_dir, 'frequency_heatmap.html'),
+                    self.geo_visualizer.create_frequency_heatmap
+                )
             else:
                 return ""
         
@@ -0,0 +1,165 @@
+#!/usr/bin/env python3
+"""
+Frequency Database Test Script for NYC Mesh Frequency Management Tool
+This script tests that the trigger-maintained conflict table matches a full recomputation.
+"""
+
+import os
+import sys
+import random
+import logging
+import tempfile
+from frequency_database import FrequencyDatabase
+
+# Configure logging
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+)
+logger = logging.getLogger('frequency_database_test')
+
+FREQUENCIES = [5180, 5200, 5500, 5745, 5765, 0, None]
+CHANNEL_WIDTHS = [20, 40, 80, None]
+
+def expected_conflicts(database):
+    """
+    Recompute conflicts by comparing every pair of configs on a frequency
+    
+    Args:
+        database: FrequencyDatabase instance
+        
+    Returns:
+        List of conflict dictionaries, in the order get_frequency_conflicts uses
+    """
+    rows = database.conn.execute('''
+    SELECT d.id, d.name, d.site_id, w.frequency, w.channel_width
+    FROM wireless_configs w
+    JOIN devices d ON d.id = w.device_id
+    WHERE w.frequency IS NOT NULL
+    ORDER BY w.rowid
+    ''').fetchall()
+    
+    # Group devices by frequency, in the order configs were stored
+    frequency_map = {}
+    for device_id, device_name, site_id, frequency, channel_width in rows:
+        if not frequency:
+            continue
+        half_width = (channel_width or 0) / 2
+        frequency_map.setdefault(frequency, []).append({
+            'id': device_id,
+            'name': device_name,
+            'site_id': site_id,
+            'freq_min': frequency - half_width,
+            'freq_max': frequency + half_width
+        })
+    
+    conflicts = []
+    for frequency, devices in frequency_map.items():
+        for i in range(len(devices)):
+            for j in range(i + 1, len(devices)):
+                device1 = devices[i]
+                device2 = devices[j]
+                if (device1['freq_min'] <= device2['freq_max'] and
+                    device1['freq_max'] >= device2['freq_min']):
+                    conflicts.append({
+                        'device1': {key: device1[key] for key in ('id', 'name', 'site_id')},
+                        'device2': {key: device2[key] for key in ('id', 'name', 'site_id')},
+                        'frequency': frequency,
+                        'overlap': min(device1['freq_max'], device2['freq_max']) -
+                                   max(device1['freq_min'], device2['freq_min'])
+                    })
+    
+    return conflicts
+
+def random_config(rng, config_id, device_ids):
+    """Build a random wireless configuration dictionary"""
+    return {
+        'id': config_id,
+        'deviceId': rng.choice(device_ids),
+        'frequency': rng.choice(FREQUENCIES),
+        'channelWidth': rng.choice(CHANNEL_WIDTHS)
+    }
+
+def test_conflict_triggers(steps=300, seed=0):
+    """Test conflicts after random inserts, replaces, updates and deletes"""
+    rng = random.Random(seed)
+    
+    with tempfile.TemporaryDirectory() as temp_dir:
+        db_path = os.path.join(temp_dir, 'conflicts.db')
+        database = FrequencyDatabase(db_path)
+        
+        # Include a device ID with no device row, whose configs never conflict
+        device_ids = [f'device-{i}' for i in range(12)]
+        database.store_devices([
+            {'id': device_id, 'name': f'Device {device_id}', 'siteId': f'site-{i % 4}'}
+            for i, device_id in enumerate(device_ids)
+        ])
+        device_ids.append('unknown-device')
+        config_ids = [f'config-{i}' for i in range(40)]
+        
+        for step in range(steps):
+            operation = rng.choice(['insert', 'replace', 'update', 'rename', 'delete', 'device'])
+            
+            if operation == 'insert':
+                database.store_wireless_configs([
+                    random_config(rng, rng.choice(config_ids), device_ids)
+                    for _ in range(rng.randint(1, 5))
+                ])
+            elif operation == 'replace':
+                # Re-storing an existing config moves it to the end of the table
+                existing = [row[0] for row in database.conn.execute('SELECT id FROM wireless_configs')]
+                if existing:
+                    config = random_config(rng, rng.choice(existing), device_ids)
+                    database.store_wireless_configs([config])
+            elif operation == 'update':
+                with database.conn:
+                    database.conn.execute(
+                        'UPDATE wireless_configs SET frequency = ?, channel_width = ? WHERE id = ?',
+                        (rng.choice(FREQUENCIES), rng.choice(CHANNEL_WIDTHS), rng.choice(config_ids))
+                    )
+            elif operation == 'rename':
+                # Changing the primary key must drop the pairs under the old ID
+                with database.conn:
+                    database.conn.execute(
+                        'UPDATE OR IGNORE wireless_configs SET id = ? WHERE id = ?',
+                        (rng.choice(config_ids), rng.choice(config_ids))
+                    )
+            elif operation == 'delete':
+                with database.conn:
+                    database.conn.execute(
+                        'DELETE FROM wireless_configs WHERE id = ?', (rng.choice(config_ids),)
+                    )
+            else:
+                # Renamed devices are picked up at read time
+                device_id = rng.choice(device_ids[:-1])
+                database.store_devices([
+                    {'id': device_id, 'name': f'Device {device_id} v{step}', 'siteId': 'site-0'}
+                ])
+            
+            assert database.get_frequency_conflicts() == expected_conflicts(database), \
+                f"Conflicts differ after step {step} ({operation})"
+        
+        # A database created before device_conflicts existed is backfilled on open
+        expected = expected_conflicts(database)
+        with database.conn:
+            database.conn.execute('DROP TABLE device_conflicts')
+        database.close()
+        
+        database = FrequencyDatabase(db_path)
+        assert database.get_frequency_conflicts() == expected, "Backfilled conflicts differ"
+        logger.info(f"Checked {steps} random changes, ending with {len(expected)} conflicts")
+        database.close()
+
+def main():
+    """Main function"""
+    try:
+        test_conflict_triggers()
+    except AssertionError:
+        logger.exception("Frequency database test failed")
+        print("\nFrequency database test failed.")
+        sys.exit(1)
+    
+    print("\nFrequency database test completed successfully!")
+
+if __name__ == "__main__":
+    main()
@@ -5,11 +5,13 @@ This script tests the geographical positioning functionality.
 """
 
 import os
+import re
 import sys
 import logging
 import argparse
+import tempfile
 from frequency_database import FrequencyDatabase
-from geographical_positioning import GeoPositioningVisualizer, GeoDashboard
+from geographical_positioning import GeoPositioningVisualizer, GeoDashboard, MAP_BUILDERS, iter_map_html
 
 # Configure logging
 logging.basicConfig(
@@ -56,6 +58,42 @@ def test_static_maps(database_path, output_dir):
         logger.error(f"Static map generation test failed: {str(e)}")
         return False
 
+def normalize_element_ids(html):
+    """Number folium's random element IDs in order of appearance"""
+    ids = {}
+    return re.sub(r'[0-9a-f]{32}', lambda match: ids.setdefault(match.group(), f"id{len(ids)}"), html)
+
+def test_iter_map_html():
+    """Test that streamed map HTML matches folium's own rendering"""
+    # iter_map_html() follows branca's Figure.render() through its private
+    # attributes, so this catches a folium or branca upgrade that changes it
+    with tempfile.TemporaryDirectory() as temp_dir:
+        database = FrequencyDatabase(os.path.join(temp_dir, 'maps.db'))
+        database.store_sites([
+            {'id': f'site-{i}', 'name': f'Site {i}',
+             'latitude': 40.70 + i * 0.002, 'longitude': -74.00 + i * 0.003}
+            for i in range(4)
+        ])
+        database.store_devices([
+            {'id': f'device-{i}', 'name': f'nycmesh-{i}-{direction}', 'siteId': f'site-{i % 4}'}
+            for i, direction in enumerate(['north', 'east', 'south', 'west', 'omni', 'north'])
+        ])
+        database.store_wireless_configs([
+            {'id': f'config-{i}', 'deviceId': f'device-{i}', 'frequency': 5180 if i % 2 else 5500,
+             'channelWidth': 20, 'txPower': 18}
+            for i in range(6)
+        ])
+        
+        visualizer = GeoPositioningVisualizer(database)
+        for map_type, (builder, _) in MAP_BUILDERS.items():
+            # Rendering is not repeatable on one map, so each side gets its own
+            streamed = ''.join(iter_map_html(getattr(visualizer, builder)()))
+            rendered = getattr(visualizer, builder)().get_root().render()
+            assert normalize_element_ids(streamed) == normalize_element_ids(rendered), \
+                f"Streamed {map_type} map differs from Figure.render()"
+        
+        database.close()
+
 def run_dashboard(database_path, port):
     """Run the interactive dashboard"""
     try:
@@ -91,6 +129,13 @@ def main():
     
     # Test static map generation
     if not args.dashboard:
+        try:
+            test_iter_map_html()
+        except AssertionError:
+            logger.exception("Map rendering test failed")
+            print("\nMap rendering test failed.")
+            sys.exit(1)
+        
         success = test_static_maps(args.db, args.output)
         
         if success:
@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+"""
+JSON Streaming Test Script for NYC Mesh Frequency Management Tool
+This script tests that streamed JSON documents match their in-memory equivalents.
+"""
+
+import io
+import sys
+import logging
+import orjson
+from json_stream import JsonStreamWriter, encode_key
+
+# Configure logging
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+)
+logger = logging.getLogger('json_stream_test')
+
+def test_json_stream_writer():
+    """Test streaming nested objects, arrays, empty containers and pre-encoded keys"""
+    expected = {
+        'timestamp': '2024-01-01T00:00:00',
+        'summary': {'total_devices': 2, 'total_conflicts': 0},
+        'conflicts': [],
+        'frequency_allocation': {
+            '5180': [{'device': {'id': 'd1', 'name': 'north'}, 'channel_width': 20}],
+            '5500': []
+        },
+        'sites': {},
+        'nested': [[1, 2], [], {'a': None}, {}],
+        'last': True
+    }
+    
+    f = io.BytesIO()
+    writer = JsonStreamWriter(f)
+    writer.begin_object()
+    writer.write_value(expected['timestamp'], key=encode_key('timestamp'))
+    writer.write_value(expected['summary'], key='summary')
+    
+    writer.begin_array(key=encode_key('conflicts'))
+    writer.end_array()
+    
+    # Integer keys are written as strings, like in the frequency report
+    writer.begin_object(key='frequency_allocation')
+    writer.write_value(expected['frequency_allocation']['5180'], key=5180)
+    writer.begin_array(key=encode_key(5500))
+    writer.end_array()
+    writer.end_object()
+    
+    writer.begin_object(key='sites')
+    writer.end_object()
+    
+    writer.begin_array(key='nested')
+    writer.begin_array()
+    writer.write_value(1)
+    writer.write_value(2)
+    writer.end_array()
+    writer.begin_array()
+    writer.end_array()
+    writer.begin_object()
+    writer.write_value(None, key='a')
+    writer.end_object()
+    writer.write_value({})
+    writer.end_array()
+    
+    writer.write_value(True, key='last')
+    writer.end_object()
+    
+    assert orjson.loads(f.getvalue()) == expected
+    
+    # Top-level arrays and scalars stream too
+    for value in ([], [{'a': [1, {}]}, 'b'], 3.5):
+        f = io.BytesIO()
+        writer = JsonStreamWriter(f)
+        if isinstance(value, list):
+            writer.begin_array()
+            for item in value:
+                writer.write_value(item)
+            writer.end_array()
+        else:
+            writer.write_value(value)
+        assert orjson.loads(f.getvalue()) == value
+
+def main():
+    """Main function"""
+    try:
+        test_json_stream_writer()
+    except AssertionError:
+        logger.exception("JSON stream test failed")
+        print("\nJSON stream test failed.")
+        sys.exit(1)
+    
+    print("\nJSON stream test completed successfully!")
+
+if __name__ == "__main__":
+    main()
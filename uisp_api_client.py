@@ -5,9 +5,10 @@ This module handles authentication and data retrieval from the UISP API.
 """
 
 import requests
-import json
+import orjson
 import logging
 import time
+import threading
 from typing import Dict, List, Any, Optional, Union
 from datetime import datetime
 
@@ -39,6 +40,7 @@ class UISPAPIClient:
         self.session = requests.Session()
         self.last_request_time = 0
         self.rate_limit_delay = 0.5  # Delay between requests in seconds
+        self._rate_limit_lock = threading.Lock()
         
         # Set up authentication
         if api_token:
@@ -83,14 +85,18 @@ class UISPAPIClient:
         Returns:
             Response data as dictionary
         """
-        # Implement rate limiting
-        current_time = time.time()
-        time_since_last_request = current_time - self.last_request_time
-        if time_since_last_request < self.rate_limit_delay:
-            time.sleep(self.rate_limit_delay - time_since_last_request)
+        # Implement rate limiting. Each caller reserves the next free slot
+        # under the lock, so requests issued from several threads stay
+        # spaced out while their round-trips overlap.
+        with self._rate_limit_lock:
+            current_time = time.time()
+            request_time = max(current_time, self.last_request_time + self.rate_limit_delay)
+            self.last_request_time = request_time
+        
+        if request_time > current_time:
+            time.sleep(request_time - current_time)
         
         url = f"{self.base_url}{endpoint}"
-        self.last_request_time = time.time()
         
         try:
             response = self.session.request(
@@ -220,6 +226,10 @@ class FrequencyDataCollector:
             'ap_profiles': None
         }
         self.cache_ttl = 300  # Cache time-to-live in seconds
+        # Getters may be called from several threads at once; holding a lock
+        # per cache while refreshing makes concurrent callers wait for the
+        # in-flight fetch instead of issuing a duplicate API request
+        self._cache_locks = {cache_type: threading.Lock() for cache_type in self.last_update}
     
     def _is_cache_valid(self, cache_type: str) -> bool:
         """
@@ -247,12 +257,13 @@ class FrequencyDataCollector:
         Returns:
             List of device dictionaries
         """
-        if force_refresh or not self._is_cache_valid('devices'):
-            logger.info("Fetching devices from UISP API")
-            self.devices_cache = self.api_client.get_devices()
-            self.last_update['devices'] = datetime.now()
-        
-        return self.devices_cache
+        with self._cache_locks['devices']:
+            if force_refresh or not self._is_cache_valid('devices'):
+                logger.info("Fetching devices from UISP API")
+                self.devices_cache = self.api_client.get_devices()
+                self.last_update['devices'] = datetime.now()
+            
+            return self.devices_cache
     
     def get_sites(self, force_refresh: bool = False) -> List[Dict]:
         """
@@ -264,12 +275,13 @@ class FrequencyDataCollector:
         Returns:
             List of site dictionaries
         """
-        if force_refresh or not self._is_cache_valid('sites'):
-            logger.info("Fetching sites from UISP API")
-            self.sites_cache = self.api_client.get_sites()
-            self.last_update['sites'] = datetime.now()
-        
-        return self.sites_cache
+        with self._cache_locks['sites']:
+            if force_refresh or not self._is_cache_valid('sites'):
+                logger.info("Fetching sites from UISP API")
+                self.sites_cache = self.api_client.get_sites()
+                self.last_update['sites'] = datetime.now()
+            
+            return self.sites_cache
     
     def get_wireless_configuration(self, force_refresh: bool = False) -> List[Dict]:
         """
@@ -281,12 +293,13 @@ class FrequencyDataCollector:
         Returns:
             List of wireless configuration dictionaries
         """
-        if force_refresh or not self._is_cache_valid('wireless_config'):
-            logger.info("Fetching wireless configuration from UISP API")
-            self.wireless_config_cache = self.api_client.get_wireless_configuration()
-            self.last_update['wireless_config'] = datetime.now()
-        
-        return self.wireless_config_cache
+        with self._cache_locks['wireless_config']:
+            if force_refresh or not self._is_cache_valid('wireless_config'):
+                logger.info("Fetching wireless configuration from UISP API")
+                self.wireless_config_cache = self.api_client.get_wireless_configuration()
+                self.last_update['wireless_config'] = datetime.now()
+            
+            return self.wireless_config_cache
     
     def get_ap_profiles(self, force_refresh: bool = False) -> List[Dict]:
         """
@@ -298,12 +311,13 @@ class FrequencyDataCollector:
         Returns:
             List of AP profile dictionaries
         """
-        if force_refresh or not self._is_cache_valid('ap_profiles'):
-            logger.info("Fetching AP profiles from UISP API")
-            self.ap_profiles_cache = self.api_client.get_ap_profiles()
-            self.last_update['ap_profiles'] = datetime.now()
-        
-        return self.ap_profiles_cache
+        with self._cache_locks['ap_profiles']:
+            if force_refresh or not self._is_cache_valid('ap_profiles'):
+                logger.info("Fetching AP profiles from UISP API")
+                self.ap_profiles_cache = self.api_client.get_ap_profiles()
+                self.last_update['ap_profiles'] = datetime.now()
+            
+            return self.ap_profiles_cache
     
     def get_frequency_data(self) -> Dict:
         """
@@ -417,8 +431,10 @@ class FrequencyDataCollector:
         data = self.get_frequency_data()
         
         try:
-            with open(filename, 'w') as f:
-                json.dump(data, f, indent=2)
+            # Serialize in one call and hand the bytes to a single write()
+            # rather than letting json.dump emit thousands of small chunks
+            with open(filename, 'wb') as f:
+                f.write(orjson.dumps(data, option=orjson.OPT_INDENT_2))
             logger.info(f"Data exported to {filename}")
         except IOError as e:
             logger.error(f"Failed to write data to {filename}: {str(e)}")